@@ -0,0 +1,255 @@
+"""
+Persistent analysis store: SQLite in WAL mode behind a batched background writer.
+
+The store is the second-level cache behind the in-memory ResultCache. It
+survives restarts and is shared by every worker process using the same
+database file. Request handlers never wait for a write: put_payload() drops
+the serialized result into a queue bounded by entries and by bytes
+(discarding it when either is exceeded), and one writer thread per process
+commits the queue in batches. Queued payloads therefore hold at most
+queue_max_bytes per process, plus the batch being written. Reads use one
+connection per thread; WAL lets them run alongside the writer.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    key TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    verdict TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_created_at ON analyses (created_at);
+"""
+PRUNE_EVERY_SECONDS = 300
+
+
+def sqlite_path(database_url: str) -> str:
+    """
+    File path from a sqlite:/// URL (sqlite:///./fakenews.db -> ./fakenews.db)
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix):
+        raise ValueError(f"Only sqlite:/// database URLs are supported, got {database_url!r}")
+    return database_url[len(prefix):]
+
+
+class AnalysisStore:
+    """
+    SQLite-backed result store with a non-blocking, batched write path
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 7 * 86400, queue_max: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 0.2,
+                 json_default: Optional[Callable[[Any], Any]] = None,
+                 queue_max_bytes: int = 64 * 1024 * 1024):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.queue_max = queue_max
+        self.queue_max_bytes = queue_max_bytes
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.json_default = json_default
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        self._stopping = False
+        self._settled = 0  # queued results that were written or failed
+        self._queued_bytes = 0  # payload bytes waiting in the queue
+        self._stats = {
+            "reads": 0, "hits": 0, "expired": 0, "queued": 0, "written": 0, "batches": 0,
+            "dropped": 0, "write_errors": 0, "pruned": 0, "last_write_lag_ms": 0.0, "max_write_lag_ms": 0.0,
+        }
+
+    # Connections
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # NORMAL is durable across application crashes in WAL mode and avoids an fsync per commit
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        connection.executescript(SCHEMA)
+        return connection
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or getattr(self._local, "pid", None) != os.getpid():
+            connection = self._connect()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _ensure_writer(self) -> None:
+        # Started lazily, so a store created before a fork gets its thread in the child
+        if self._pid == os.getpid() and self._writer is not None:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._writer is not None:
+                return
+            self._pid = os.getpid()
+            self._stopping = False
+            self._queued_bytes = 0
+            self._queue = queue.Queue(maxsize=self.queue_max)
+            self._writer = threading.Thread(target=self._write_loop, name="analysis-store-writer", daemon=True)
+            self._writer.start()
+
+    # Request path
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored result for key, or None when missing or older than ttl_seconds (blocking; run on the I/O pool)
+        """
+        payload = self.get_payload(key)
+        return json.loads(payload) if payload is not None else None
+
+    def get_payload(self, key: str) -> Optional[str]:
+        """
+        Like get(), but the stored JSON text, for callers that keep it serialized
+        """
+        row = self._reader().execute("SELECT created_at, payload FROM analyses WHERE key = ?", (key,)).fetchone()
+        with self._lock:
+            self._stats["reads"] += 1
+            if row is None:
+                return None
+            if time.time() - row[0] > self.ttl_seconds:
+                self._stats["expired"] += 1
+                return None
+            self._stats["hits"] += 1
+        return row[1]
+
+    def put(self, key: str, value: Dict[str, Any]) -> bool:
+        """
+        Queue a result for writing; never blocks. Returns False when the queue is full.
+        """
+        payload = json.dumps(value, default=self.json_default).encode("utf-8")
+        return self.put_payload(key, value.get("verdict"), payload)
+
+    def put_payload(self, key: str, verdict: Optional[str], payload: bytes) -> bool:
+        """
+        Queue an already serialized result (JSON bytes); never blocks. Returns False when
+        the queue is full by entries or by bytes.
+        """
+        self._ensure_writer()
+        with self._lock:
+            if self._queued_bytes + len(payload) > self.queue_max_bytes:
+                self._stats["dropped"] += 1
+                return False
+            self._queued_bytes += len(payload)
+        try:
+            self._queue.put_nowait((key, time.time(), verdict, payload))
+        except queue.Full:
+            with self._lock:
+                self._queued_bytes -= len(payload)
+                self._stats["dropped"] += 1
+            return False
+        with self._lock:
+            self._stats["queued"] += 1
+        return True
+
+    # Writer thread
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        work = self._queue
+        last_prune = 0.0
+        while True:
+            try:
+                batch = [work.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self._stopping:
+                    break
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(work.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(connection, batch)
+            if time.time() - last_prune > PRUNE_EVERY_SECONDS:
+                last_prune = time.time()
+                self._prune(connection)
+        connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, batch) -> None:
+        with self._lock:
+            self._queued_bytes -= sum(len(payload) for _, _, _, payload in batch)
+        # Decoded here, off the request path, so the column keeps holding JSON text
+        rows = [(key, created_at, verdict, payload.decode("utf-8")) for key, created_at, verdict, payload in batch]
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.executemany(
+                "INSERT OR REPLACE INTO analyses (key, created_at, verdict, payload) VALUES (?, ?, ?, ?)", rows
+            )
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"⚠️ Analysis store write failed ({len(batch)} results): {e}")
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            with self._lock:
+                self._stats["write_errors"] += 1
+                self._settled += len(batch)
+            return
+        lag_ms = (time.time() - batch[0][1]) * 1000
+        with self._lock:
+            self._stats["written"] += len(batch)
+            self._settled += len(batch)
+            self._stats["batches"] += 1
+            self._stats["last_write_lag_ms"] = round(lag_ms, 2)
+            self._stats["max_write_lag_ms"] = round(max(self._stats["max_write_lag_ms"], lag_ms), 2)
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        try:
+            cursor = connection.execute("DELETE FROM analyses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        except sqlite3.Error as e:
+            print(f"⚠️ Analysis store prune failed: {e}")
+            return
+        with self._lock:
+            self._stats["pruned"] += cursor.rowcount
+
+    # Lifecycle
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until everything queued so far is written; True if the queue drained in time
+        """
+        deadline = time.monotonic() + timeout
+        while self._queue is not None and self._pid == os.getpid():
+            with self._lock:
+                if self._settled >= self._stats["queued"]:
+                    return True
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Write out the queue and stop the writer thread
+        """
+        if self._writer is None or self._pid != os.getpid():
+            return
+        self._stopping = True
+        self._writer.join(timeout)
+        self._writer = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+        stats["queue_bytes"] = self._queued_bytes if self._pid == os.getpid() else 0
+        stats["queue_max"] = self.queue_max
+        stats["queue_max_bytes"] = self.queue_max_bytes
+        stats["path"] = self.path
+        return stats
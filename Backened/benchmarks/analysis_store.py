@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Measure the persistent analysis store: enqueue cost, write throughput, write lag and read latency
+
+Run from the Backened folder:
+
+    python benchmarks/analysis_store.py [--results 20000] [--processes 4] [--rate 0]
+
+Each process plays one server worker: it puts --results analysis-sized
+results into its own AnalysisStore (all sharing one SQLite file) as fast as
+possible, or at --rate results per second, while reading back random keys.
+put() must stay in the microseconds; lag is the time from put() until
+the batch holding it was committed.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from analysis_store import AnalysisStore  # noqa: E402
+
+
+def sample_result(n):
+    return {
+        "verdict": "FAKE" if n % 3 else "REAL",
+        "confidence": 0.87,
+        "analysis": {
+            "llm_analysis": {
+                "verdict": "FAKE",
+                "confidence": 0.9,
+                "key_factors": ["Found 3 suspicious indicators, 0 credible indicators", "Emotional language detected"],
+                "recommendations": ["Cross-reference with multiple reliable sources"] * 3,
+            },
+            "ml_analysis": {"verdict": "FAKE", "confidence": 0.81, "ml_analysis": "Random Forest prediction"},
+            "sentiment_analysis": {"sentiment": {"compound": -0.4, "pos": 0.1, "neu": 0.6, "neg": 0.3},
+                                   "linguistic_features": {"sentence_count": 12, "word_count": 240}},
+            "text_length": 1400 + n % 500,
+            "skipped_stages": {},
+        },
+        "factors": ["Sensational headline", "No named sources"],
+        "recommendations": ["Check official channels"],
+        "evidence": {"twitter_mentions": {"count": n % 50}},
+        "timestamp": "2026-01-01T00:00:00",
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_worker(path, worker, results, rate, output):
+    store = AnalysisStore(path, flush_interval=0.05)
+    rng = random.Random(worker)
+    put_us, read_us = [], []
+    started = time.perf_counter()
+    for n in range(results):
+        if rate:
+            # Pace to the target rate instead of writing flat out
+            delay = started + n / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        value = sample_result(n)
+        t = time.perf_counter()
+        store.put(f"w{worker}-{n}", value)
+        put_us.append((time.perf_counter() - t) * 1e6)
+        if n % 20 == 0 and n:
+            t = time.perf_counter()
+            store.get(f"w{worker}-{rng.randrange(n)}")
+            read_us.append((time.perf_counter() - t) * 1e6)
+    enqueue_seconds = time.perf_counter() - started
+    drained = store.flush(timeout=60)
+    total_seconds = time.perf_counter() - started
+    stats = store.stats()
+    store.close()
+    output.put({
+        "put_us": put_us, "read_us": read_us, "enqueue_seconds": enqueue_seconds,
+        "total_seconds": total_seconds, "drained": drained, "stats": stats,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=20000, help="results written per process")
+    parser.add_argument("--processes", type=int, default=2, help="worker processes sharing the database")
+    parser.add_argument("--rate", type=float, default=0, help="results per second per process (0 = flat out)")
+    parser.add_argument("--path", help="database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.path or os.path.join(tempfile.mkdtemp(prefix="analysis_store_"), "bench.db")
+    AnalysisStore(path).get("warm-up")  # create the schema once before the workers race for it
+    context = multiprocessing.get_context("spawn")
+    output = context.Queue()
+    workers = [context.Process(target=run_worker, args=(path, worker, args.results, args.rate, output))
+               for worker in range(args.processes)]
+    for process in workers:
+        process.start()
+    reports = [output.get() for _ in workers]
+    for process in workers:
+        process.join()
+
+    put_us = [value for report in reports for value in report["put_us"]]
+    read_us = [value for report in reports for value in report["read_us"]]
+    written = sum(report["stats"]["written"] for report in reports)
+    dropped = sum(report["stats"]["dropped"] for report in reports)
+    total_seconds = max(report["total_seconds"] for report in reports)
+
+    print(f"database           {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    print(f"processes          {args.processes} x {args.results} results"
+          f"{f' at {args.rate:.0f}/s' if args.rate else ' flat out'}")
+    print(f"put()              p50 {statistics.median(put_us):.1f} us, p99 {percentile(put_us, 0.99):.1f} us")
+    if read_us:
+        print(f"get()              p50 {statistics.median(read_us):.1f} us, p99 {percentile(read_us, 0.99):.1f} us")
+    print(f"written            {written} ({written / total_seconds:,.0f}/s, {written / total_seconds * 60:,.0f}/min), "
+          f"dropped {dropped}")
+    print(f"write lag          max {max(report['stats']['max_write_lag_ms'] for report in reports):.1f} ms")
+    print(f"batches            {sum(report['stats']['batches'] for report in reports)}")
+    if not all(report["drained"] for report in reports):
+        print("⚠️ some writers did not drain within 60 s")
+
+
+if __name__ == "__main__":
+    main()
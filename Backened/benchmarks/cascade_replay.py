@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Offline replay of the LLM cascade over a labeled dataset
+
+For every article the pattern rules and the RandomForest are run, and the
+LLM answer is taken from a JSONL file of recorded results. Articles missing
+from that file are sent once to the configured LLM backend (the offline stub
+unless GEMINI_API_KEY is set) and appended, so later replays make no calls.
+Each cascade band is then compared with the full pipeline (LLM always
+called) on LLM calls, estimated latency, agreement and accuracy.
+
+Run from the Backened folder after training:
+
+    python benchmarks/cascade_replay.py --dataset WELFake_Dataset.csv --sample 500 \\
+        --llm-results cascade_llm_results.jsonl --bands 0.1-0.9,0.15-0.85,0.25-0.75
+
+Labels follow modeltrain.py: 1 = FAKE, 0 = REAL. Without --dataset a small
+synthetic set is used, which only demonstrates the mechanics.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+FAKE_FRAGMENTS = [
+    "SHOCKING: doctors hate this one trick",
+    "share before it is deleted",
+    "the government is hiding the truth about this miracle cure",
+    "register now with your Aadhaar and bank details to claim free government money",
+    "you won't believe what happens next",
+    "secret scheme gives free laptops to all students, offer ends today",
+]
+REAL_FRAGMENTS = [
+    "According to officials, the ministry published its annual report on Tuesday",
+    "the budget allocation for rural health centres rose by 4 percent",
+    "a spokesperson confirmed the figures in a press release",
+    "the study was published in a peer-reviewed journal",
+    "the court adjourned the hearing until next month",
+    "data from the statistics office showed inflation eased slightly",
+]
+NEUTRAL_FRAGMENTS = [
+    "people in several cities discussed the news on social media",
+    "the announcement drew mixed reactions",
+    "more details are expected later this week",
+]
+
+
+def synthetic_dataset(size, seed):
+    rng = random.Random(seed)
+    rows = []
+    for index in range(size):
+        label = index % 2
+        primary, secondary = (FAKE_FRAGMENTS, REAL_FRAGMENTS) if label else (REAL_FRAGMENTS, FAKE_FRAGMENTS)
+        parts = rng.sample(primary, rng.randint(1, 3)) + rng.sample(NEUTRAL_FRAGMENTS, rng.randint(0, 2))
+        if rng.random() < 0.3:
+            # Some articles mix signals, so the cheap stages are not always sure
+            parts.append(rng.choice(secondary))
+        rng.shuffle(parts)
+        rows.append({"title": "", "text": ". ".join(parts) + ".", "label": label})
+    return rows
+
+
+def load_rows(path, sample, seed):
+    if not path:
+        print("⚠️  No --dataset given; using a synthetic set (numbers only illustrate the mechanics)")
+        return synthetic_dataset(sample, seed)
+    from modeltrain import load_dataset
+    df = load_dataset(path)
+    df = df[df["text"].str.len() >= 10]
+    df = df.sample(n=min(sample, len(df)), random_state=seed)
+    return [{"title": row.title, "text": row.text, "label": int(row.label)} for row in df.itertuples()]
+
+
+def text_key(row):
+    return hashlib.sha256(f"{row['title']}\0{row['text']}".encode("utf-8")).hexdigest()
+
+
+def load_llm_results(path):
+    results = {}
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    results[entry["key"]] = entry
+    return results
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def parse_bands(spec):
+    bands = []
+    for part in spec.split(","):
+        low, high = part.split("-")
+        bands.append((float(low), float(high)))
+    return bands
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dataset", help="CSV with title, text and label columns (e.g. WELFake_Dataset.csv)")
+    parser.add_argument("--sample", type=int, default=300, help="articles to replay")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-results", default="cascade_llm_results.jsonl",
+                        help="JSONL of recorded LLM results; missing entries are recorded")
+    parser.add_argument("--llm-latency-ms", type=float, default=None,
+                        help="latency charged per LLM call (default: mean of recorded calls, or 1500 "
+                             "when they came from the instant offline stub)")
+    parser.add_argument("--bands", default="0.1-0.9,0.15-0.85,0.2-0.8,0.3-0.7")
+    parser.add_argument("--ml-decisive", type=float, default=None, help="override CASCADE_ML_DECISIVE")
+    args = parser.parse_args()
+
+    import app
+    import config
+    from cascade import CascadePolicy
+
+    app.initialize_models()
+    app.initialize_llm_client()
+    if app.llm_client is not None:
+        # Recording is sequential and one-off; bypass the serving rate limit and breaker
+        app.llm_client = app.llm_client.backend
+    rows = load_rows(args.dataset, args.sample, args.seed)
+    print(f"Replaying {len(rows)} articles (LLM backend: {app.llm_client.name if app.llm_client else 'patterns'})")
+
+    # Cheap stages, timed per article
+    cheap = []
+    for row in rows:
+        started = time.perf_counter()
+        patterns = app.analyze_with_patterns(row["text"], row["title"] or None)
+        ml = app.analyze_with_ml(row["text"])
+        cheap.append({"patterns": patterns, "ml": ml, "ms": (time.perf_counter() - started) * 1000})
+
+    # LLM results: replayed from the file, recorded when missing
+    recorded = load_llm_results(args.llm_results)
+    new_entries = 0
+    with open(args.llm_results, "a", encoding="utf-8") as out:
+        for row in rows:
+            key = text_key(row)
+            if key in recorded:
+                continue
+            started = time.perf_counter()
+            result = app.analyze_with_llm(row["text"], row["title"] or None)
+            entry = {"key": key, "result": result, "ms": (time.perf_counter() - started) * 1000}
+            out.write(json.dumps(entry) + "\n")
+            recorded[key] = entry
+            new_entries += 1
+    if new_entries:
+        print(f"Recorded {new_entries} new LLM results in {args.llm_results}")
+    llm = [recorded[text_key(row)] for row in rows]
+
+    llm_ms = args.llm_latency_ms
+    if llm_ms is None:
+        measured = [entry["ms"] for entry in llm if entry.get("ms")]
+        llm_ms = statistics.mean(measured) if measured and statistics.mean(measured) >= 50 else 1500.0
+    print(f"Charging {llm_ms:.0f} ms per LLM call\n")
+
+    def verdict(row, results):
+        return app.combine_results(row["text"], row["title"] or None, "text", results, {}).verdict
+
+    full_verdicts = [
+        verdict(row, {"llm": entry["result"], "ml": stages["ml"], "patterns": stages["patterns"]})
+        for row, stages, entry in zip(rows, cheap, llm)
+    ]
+    # The full pipeline runs its stages concurrently, so it waits for the slowest (the LLM)
+    full_latency = [max(stages["ms"], llm_ms) for stages in cheap]
+    labels = ["FAKE" if row["label"] == 1 else "REAL" for row in rows]
+    full_accuracy = sum(v == label for v, label in zip(full_verdicts, labels)) / len(rows)
+
+    header = f"{'policy':<14}{'LLM calls':>11}{'saved':>8}{'mean ms':>10}{'p95 ms':>9}{'agree':>8}{'accuracy':>10}"
+    print(header)
+    print("-" * len(header))
+    print(f"{'full':<14}{len(rows):>11}{'0%':>8}{statistics.mean(full_latency):>10.0f}"
+          f"{percentile(full_latency, 0.95):>9.0f}{'100%':>8}{full_accuracy:>10.1%}")
+
+    for low, high in parse_bands(args.bands):
+        policy = CascadePolicy(
+            low=low,
+            high=high,
+            ml_weight=config.CASCADE_ML_WEIGHT,
+            ml_decisive=args.ml_decisive if args.ml_decisive is not None else config.CASCADE_ML_DECISIVE,
+            gov_scam_decisive=config.CASCADE_GOV_SCAM_DECISIVE,
+        )
+        calls, latency, verdicts = 0, [], []
+        for row, stages, entry, full in zip(rows, cheap, llm, full_verdicts):
+            decision = policy.decide(stages["patterns"], stages["ml"])
+            if decision["escalated"]:
+                calls += 1
+                latency.append(stages["ms"] + llm_ms)
+                verdicts.append(full)
+            else:
+                latency.append(stages["ms"])
+                verdicts.append(verdict(row, {"ml": stages["ml"], "patterns": stages["patterns"], "cascade": decision}))
+        agreement = sum(v == full for v, full in zip(verdicts, full_verdicts)) / len(rows)
+        accuracy = sum(v == label for v, label in zip(verdicts, labels)) / len(rows)
+        print(f"{f'{low}-{high}':<14}{calls:>11}{1 - calls / len(rows):>8.0%}{statistics.mean(latency):>10.0f}"
+              f"{percentile(latency, 0.95):>9.0f}{agreement:>8.1%}{accuracy:>10.1%}")
+
+    print(f"\nCheap stages: {statistics.mean(stages['ms'] for stages in cheap):.1f} ms mean per article")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Measure backend cold start: module import time and time to first response
+
+Each run starts a fresh interpreter. Run from the Backened folder after training:
+
+    python benchmarks/cold_start.py [--runs 5] [--top 15]
+
+import       time to `import app` (no models loaded yet)
+listening    process start until GET /health answers
+first result process start until the first POST /analyze/text returns 200
+
+The server runs with the offline stub LLM so Gemini latency is not measured.
+Both warm-up modes are compared: background (serve first, load models in a
+thread) and blocking (load models before accepting connections).
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CHILD = """
+import sys, time
+sys.path.insert(0, {backend_dir!r})
+start = time.perf_counter()
+import app
+print(time.perf_counter() - start)
+"""
+
+SAMPLE_REQUEST = json.dumps({
+    "text": "Government announces new education policy for students across the country",
+    "title": "Education policy update",
+}).encode("utf-8")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(model_dir):
+    code = IMPORT_CHILD.format(backend_dir=BACKEND_DIR)
+    output = subprocess.run([sys.executable, "-c", code], cwd=model_dir, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(model_dir, top):
+    """Parse `python -X importtime` and return the modules with the largest cumulative time"""
+    code = f"import sys; sys.path.insert(0, {BACKEND_DIR!r}); import app"
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=model_dir, capture_output=True, text=True, check=True)
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only modules imported directly by app.py (one nesting level, two spaces per level);
+        # deeper modules are already counted in their parent's cumulative time
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+
+def wait_for(url, deadline, data=None):
+    while time.monotonic() < deadline:
+        try:
+            request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+            with urllib.request.urlopen(request, timeout=60) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            time.sleep(0.02)
+    return False
+
+
+def measure_server(model_dir, background_warmup, timeout):
+    port = free_port()
+    env = dict(os.environ, LLM_BACKEND="stub", BACKGROUND_WARMUP="true" if background_warmup else "false",
+               PYTHONPATH=BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    started = time.monotonic()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=model_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + timeout
+        base = f"http://127.0.0.1:{port}"
+        if not wait_for(f"{base}/health", deadline):
+            raise RuntimeError("server did not start listening in time")
+        listening = time.monotonic() - started
+        if not wait_for(f"{base}/analyze/text", deadline, data=SAMPLE_REQUEST):
+            raise RuntimeError("first analysis did not succeed in time")
+        first_result = time.monotonic() - started
+        return {"listening_seconds": listening, "first_result_seconds": first_result}
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per measurement")
+    parser.add_argument("--top", type=int, default=10, help="slowest top-level imports to list")
+    parser.add_argument("--model-dir", default=BACKEND_DIR, help="folder containing the trained model files")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds to wait for a server start")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results only")
+    args = parser.parse_args()
+
+    imports = [measure_import(args.model_dir) for _ in range(args.runs)]
+    results = {
+        "import_seconds": statistics.median(imports),
+        "slowest_imports": slowest_imports(args.model_dir, args.top),
+    }
+    for mode, background in (("background_warmup", True), ("blocking_warmup", False)):
+        runs = [measure_server(args.model_dir, background, args.timeout) for _ in range(args.runs)]
+        results[mode] = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"import app: {results['import_seconds'] * 1000:.0f} ms (median of {args.runs})")
+    print("\nslowest top-level imports (cumulative ms):")
+    for name, seconds in results["slowest_imports"]:
+        print(f"  {name:<40} {seconds * 1000:>8.1f}")
+    print(f"\n{'mode':<20} {'listening ms':>14} {'first result ms':>16}")
+    for mode in ("background_warmup", "blocking_warmup"):
+        print(f"{mode:<20} {results[mode]['listening_seconds'] * 1000:>14.0f} {results[mode]['first_result_seconds'] * 1000:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end load test of the API
+
+Starts the app in-process (uvicorn on a background thread) with the stub LLM,
+a local HTTP server for /analyze/url targets and generated images for
+/analyze/image/upload. A fixed number of client threads (closed loop) then
+send a mix of requests drawn from a seeded generator, so the same arguments
+send the same content. The report gives throughput and p50/p95/p99 latency
+per endpoint, as JSON. No network access is needed.
+
+Run from the Backened folder after training:
+
+    python benchmarks/load_test.py --concurrency 16 --requests 2000 --output run.json
+    python benchmarks/load_test.py --mix text=50,url=20,image=10,stream=10,batch=10 --duration 60
+    python benchmarks/load_test.py --compare before.json --output after.json
+    python benchmarks/load_test.py --target http://localhost:8000   # a server that is already running
+
+Client and server share one interpreter in the default mode, so absolute
+numbers are below what a dedicated server reaches. Use them to compare
+builds on the same machine, not as a capacity figure.
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(BACKEND_DIR, "benchmarks"))
+
+from local_http_server import start_server  # noqa: E402
+
+DEFAULT_MIX = "text=55,url=20,image=10,stream=10,batch=5"
+
+FAKE_SENTENCES = [
+    "SHOCKING: doctors hate this one trick that the government is hiding",
+    "Share before it is deleted, the mainstream media won't tell you this",
+    "All students will receive a free laptop, register your name on the viral WhatsApp link",
+    "Scientists confirm impossible: the sun will rise from the west next week",
+    "Claim your prize now, this limited time offer ends today",
+]
+REAL_SENTENCES = [
+    "According to officials, the ministry published its annual report on Tuesday",
+    "The study was published in a peer-reviewed journal by researchers at the university",
+    "A spokesperson confirmed the budget figures in a press release",
+    "Data from the statistics office showed that inflation eased slightly last quarter",
+    "The court adjourned the hearing until next month after both sides presented evidence",
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def make_text(rng, sentences=6):
+    pool = FAKE_SENTENCES if rng.random() < 0.5 else REAL_SENTENCES
+    parts = [rng.choice(pool) for _ in range(sentences)] + [rng.choice(REAL_SENTENCES + FAKE_SENTENCES)]
+    return ". ".join(parts) + "."
+
+
+def make_images(count, seed):
+    """
+    PNG screenshots of short news texts; empty when Pillow is not installed
+    """
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        return []
+    rng = random.Random(seed)
+    images = []
+    for _ in range(count):
+        image = Image.new("RGB", (900, 260), "white")
+        draw = ImageDraw.Draw(image)
+        for line, sentence in enumerate(rng.sample(FAKE_SENTENCES + REAL_SENTENCES, 4)):
+            draw.text((20, 20 + line * 55), sentence[:90], fill="black")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG")
+        images.append(buffer.getvalue())
+    return images
+
+
+class Workload:
+    """
+    Seeded request generator; the same arguments always produce the same sequence of requests
+    """
+
+    def __init__(self, mix, seed, repeat_ratio, url_base, images):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.kinds = [kind for kind, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.repeat_ratio = repeat_ratio
+        self.url_base = url_base
+        self.images = images
+        # Repeated content exercises the caches; the rest is new on every request
+        self.hot_texts = [make_text(self.rng) for _ in range(20)]
+        self.unique = itertools.count()
+
+    def _text(self):
+        if self.rng.random() < self.repeat_ratio:
+            return self.rng.choice(self.hot_texts)
+        return f"Report {next(self.unique)}: {make_text(self.rng)}"
+
+    def payload(self, kind):
+        if kind in ("text", "stream"):
+            return {"text": self._text()}
+        if kind == "batch":
+            return {"items": [{"text": self._text()} for _ in range(10)]}
+        if kind == "url":
+            article = self.rng.randrange(20) if self.rng.random() < self.repeat_ratio else 1000 + next(self.unique)
+            return {"url": f"{self.url_base}/{self.rng.choice(('article', 'fresh', 'nocache'))}/{article}"}
+        return self.rng.randrange(len(self.images))
+
+    def next(self):
+        """
+        The next (kind, payload); safe to call from several client threads
+        """
+        with self.lock:
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            return kind, self.payload(kind)
+
+
+ENDPOINTS = {
+    "text": "/analyze/text",
+    "stream": "/analyze/text/stream",
+    "batch": "/analyze/batch",
+    "url": "/analyze/url",
+    "image": "/analyze/image/upload",
+}
+
+
+def send(session, base, kind, payload, images, timeout):
+    """
+    One request; returns (status, seconds, ttfb_seconds)
+    """
+    url = base + ENDPOINTS[kind]
+    started = time.perf_counter()
+    if kind == "image":
+        response = session.post(url, files={"file": ("screenshot.png", images[payload], "image/png")},
+                                timeout=timeout, stream=True)
+    else:
+        response = session.post(url, json=payload, timeout=timeout, stream=True)
+    first_byte = None
+    for _ in response.iter_content(chunk_size=None):
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+    response.close()
+    return response.status_code, elapsed, first_byte if first_byte is not None else elapsed
+
+
+def preflight(base, workload, images, timeout):
+    """
+    Drop endpoints the server cannot serve here (503, e.g. OCR without Tesseract, or no
+    Pillow for sample images); returns (usable, skipped, failed). Any other error
+    response is a failure: the endpoint stays in the mix so its errors are counted.
+    """
+    usable, skipped, failed = [], {}, {}
+    session = requests.Session()
+    for kind in workload.kinds:
+        if kind == "image" and not images:
+            skipped[kind] = "Pillow is not installed, no sample images"
+            continue
+        try:
+            status, _, _ = send(session, base, kind, workload.payload(kind), images, timeout)
+        except requests.RequestException as e:
+            status = None
+            failed[kind] = f"request failed: {e}"
+        if status == 503:
+            skipped[kind] = "server answered 503 (dependency not available)"
+            continue
+        if status is not None and status >= 400:
+            failed[kind] = f"server answered {status}"
+        usable.append(kind)
+    session.close()
+    return usable, skipped, failed
+
+
+def run_load(base, workload, images, count, concurrency, duration, timeout):
+    """
+    Closed loop: each client thread sends the next scheduled request as soon as its previous one
+    returns, until count requests were sent or duration seconds have passed
+    """
+    position = itertools.count()
+    samples = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration if duration else None
+
+    def client():
+        session = requests.Session()
+        local = []
+        while True:
+            if next(position) >= count or (deadline and time.monotonic() > deadline):
+                break
+            kind, payload = workload.next()
+            try:
+                status, elapsed, first_byte = send(session, base, kind, payload, images, timeout)
+            except requests.RequestException as e:
+                status, elapsed, first_byte = type(e).__name__, timeout, timeout
+            local.append((kind, status, elapsed, first_byte))
+        session.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=client, name=f"load-client-{n}") for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, wall_seconds):
+    def block(rows):
+        ok = [row for row in rows if isinstance(row[1], int) and row[1] < 400]
+        latencies = [row[2] * 1000 for row in ok]
+        summary = {
+            "requests": len(rows),
+            "errors": len(rows) - len(ok),
+            "status": dict(Counter(str(row[1]) for row in rows)),
+            "throughput_rps": round(len(ok) / wall_seconds, 2) if wall_seconds else 0.0,
+        }
+        if latencies:
+            summary.update({
+                "mean_ms": round(sum(latencies) / len(latencies), 2),
+                "p50_ms": round(percentile(latencies, 0.50), 2),
+                "p95_ms": round(percentile(latencies, 0.95), 2),
+                "p99_ms": round(percentile(latencies, 0.99), 2),
+                "max_ms": round(max(latencies), 2),
+                "ttfb_p50_ms": round(percentile([row[3] * 1000 for row in ok], 0.50), 2),
+            })
+        return summary
+
+    by_kind = {}
+    for row in samples:
+        by_kind.setdefault(row[0], []).append(row)
+    return {ENDPOINTS[kind]: block(rows) for kind, rows in sorted(by_kind.items())}, block(samples)
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def start_app(model_dir, work_dir, llm_latency_ms, overrides):
+    """
+    Import and serve the app on a background thread with offline settings; returns (server, base_url)
+    """
+    os.environ.update({
+        "LLM_BACKEND": "stub",
+        "LLM_STUB_LATENCY_MS": str(llm_latency_ms),
+        "BACKGROUND_WARMUP": "false",
+        "DATABASE_URL": f"sqlite:///{os.path.join(work_dir, 'loadtest.db')}",
+        "URL_CACHE_DIR": os.path.join(work_dir, "url_cache"),
+    })
+    os.environ.update(overrides)
+    os.chdir(model_dir)
+    sys.path.insert(0, BACKEND_DIR)
+    import uvicorn
+    import app
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    deadline = time.monotonic() + 300
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("server did not start within 300 s")
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def print_report(report, compare=None):
+    rows = dict(report["endpoints"], overall=report["overall"])
+    baseline = dict(compare["endpoints"], overall=compare["overall"]) if compare else {}
+    header = f"{'endpoint':<24}{'reqs':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    if compare:
+        header += f"{'Δ p95':>9}{'Δ req/s':>9}"
+    print(header, file=sys.stderr)
+    print("-" * len(header), file=sys.stderr)
+    for name, row in rows.items():
+        line = (f"{name:<24}{row['requests']:>7}{row['errors']:>8}{row['throughput_rps']:>9.1f}"
+                f"{row.get('p50_ms', 0):>10.1f}{row.get('p95_ms', 0):>10.1f}{row.get('p99_ms', 0):>10.1f}")
+        before = baseline.get(name)
+        if before and before.get("p95_ms") and row.get("p95_ms"):
+            line += f"{row['p95_ms'] / before['p95_ms'] - 1:>+9.0%}"
+            line += f"{row['throughput_rps'] / before['throughput_rps'] - 1 if before['throughput_rps'] else 0:>+9.0%}"
+        print(line, file=sys.stderr)
+    for kind, reason in report["skipped_endpoints"].items():
+        print(f"⚠️  {ENDPOINTS[kind]} skipped: {reason}", file=sys.stderr)
+    for kind, reason in report["preflight_failures"].items():
+        print(f"❌ {ENDPOINTS[kind]} failed its first request: {reason}", file=sys.stderr)
+
+
+def parse_mix(spec):
+    mix = []
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        if kind.strip() not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {kind!r}; choose from {', '.join(ENDPOINTS)}")
+        mix.append((kind.strip(), float(weight or 1)))
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads (requests in flight)")
+    parser.add_argument("--requests", type=int, default=500, help="requests in the measured run")
+    parser.add_argument("--duration", type=float, default=0, help="run for this many seconds instead of --requests")
+    parser.add_argument("--warmup", type=int, default=20, help="requests sent before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"endpoint weights (default {DEFAULT_MIX})")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="share of requests repeating earlier content (cache hits)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="stub LLM latency per call")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds")
+    parser.add_argument("--model-dir", default=BACKEND_DIR, help="folder containing the trained model files")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra server settings (repeatable)")
+    parser.add_argument("--target", help="base URL of a running server instead of starting one in-process")
+    parser.add_argument("--output", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="earlier JSON report to show p95 and throughput changes against")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="load_test_")
+    url_server, url_base = start_server()
+    images = make_images(8, args.seed)
+    workload = Workload(args.mix, args.seed, args.repeat_ratio, url_base, images)
+
+    if args.target:
+        # The remote server must be able to reach this machine's local article server
+        server, base = None, args.target.rstrip("/")
+    else:
+        overrides = dict(item.split("=", 1) for item in args.env)
+        server, base = start_app(os.path.abspath(args.model_dir), work_dir, args.llm_latency_ms, overrides)
+
+    try:
+        usable, skipped, failed = preflight(base, workload, images, args.timeout)
+        if not usable:
+            print("❌ No endpoint in the mix could be served", file=sys.stderr)
+            return 1
+        workload = Workload([(kind, weight) for kind, weight in args.mix if kind in usable],
+                            args.seed, args.repeat_ratio, url_base, images)
+        if args.warmup:
+            run_load(base, workload, images, args.warmup, args.concurrency, 0, args.timeout)
+        count = args.requests if not args.duration else sys.maxsize
+        samples, wall_seconds = run_load(base, workload, images, count, args.concurrency, args.duration, args.timeout)
+        health = requests.get(f"{base}/health", timeout=args.timeout).json()
+    finally:
+        if server is not None:
+            server.should_exit = True
+        url_server.shutdown()
+
+    endpoints, overall = summarize(samples, wall_seconds)
+    report = {
+        "config": {
+            "concurrency": args.concurrency, "requests": None if args.duration else args.requests,
+            "duration": args.duration,
+            "warmup": args.warmup, "mix": dict(args.mix), "repeat_ratio": args.repeat_ratio, "seed": args.seed,
+            "llm_latency_ms": None if args.target else args.llm_latency_ms, "target": args.target or "in-process",
+            "env": dict(item.split("=", 1) for item in args.env),
+        },
+        "environment": environment(),
+        "wall_seconds": round(wall_seconds, 3),
+        "endpoints": endpoints,
+        "overall": overall,
+        "skipped_endpoints": skipped,
+        "preflight_failures": failed,
+        "server": {key: health.get(key) for key in ("cache", "store", "ml_batcher", "pools", "llm")},
+    }
+
+    compare = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare = json.load(f)
+    print_report(report, compare)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0 if overall["errors"] == 0 and not failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server with news-like pages for exercising URL analysis offline
+
+Routes:
+    /article/<n>        HTML article with ETag and Last-Modified (answers 304 to conditional GETs)
+    /fresh/<n>          HTML article with Cache-Control: max-age=60 (served from disk cache on repeat)
+    /nocache/<n>        HTML article without validators (never cached)
+    /large?bytes=N      HTML page of N bytes with Content-Length
+    /stream?bytes=N     HTML page of N bytes sent chunked (no Content-Length)
+    /image.png          binary content type (rejected before download)
+    /slow?seconds=S     HTML article after a delay
+
+Run from the Backened folder:
+
+    python benchmarks/local_http_server.py           # serve on a free port until Ctrl+C
+    python benchmarks/local_http_server.py --check   # run the fetcher checks against it and exit
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAST_MODIFIED = formatdate(time.time() - 3600, usegmt=True)
+
+HEADLINES = [
+    "Government announces new education policy for students",
+    "SHOCKING: Doctors hate this one trick, you won't believe what happens next",
+    "Ministry confirms budget allocation for rural health centres",
+    "Breaking: secret cure hidden by big pharma, share before it is deleted",
+]
+
+
+def article_html(n: int) -> str:
+    headline = HEADLINES[n % len(HEADLINES)]
+    paragraphs = "".join(
+        f"<p>{headline}. According to officials, paragraph {i} of article {n} gives further detail "
+        f"about the announcement and its expected impact on citizens.</p>"
+        for i in range(8)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{headline}</title></head>"
+        f"<body><nav><a href=\"/\">Home</a> | <a href=\"/news\">News</a></nav>"
+        f"<article><h1>{headline}</h1>{paragraphs}</article>"
+        f"<footer>Copyright Local News {n}</footer></body></html>"
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40 ms per response
+    disable_nagle_algorithm = True
+    stats = {"requests": 0, "not_modified": 0}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _count(self, name):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _send(self, status, body=b"", content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            if body and self.command != "HEAD":
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # Client stopped reading at its size cap
+            self.close_connection = True
+
+    def do_GET(self):
+        self._count("requests")
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        parts = parsed.path.strip("/").split("/")
+
+        if parts[0] in ("article", "fresh", "nocache") and len(parts) == 2 and parts[1].isdigit():
+            body = article_html(int(parts[1])).encode("utf-8")
+            headers = {}
+            if parts[0] == "article":
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                headers = {"ETag": etag, "Last-Modified": LAST_MODIFIED}
+                if self.headers.get("If-None-Match") == etag or self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                    self._count("not_modified")
+                    self.send_response(304)
+                    for name, value in headers.items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    return
+            elif parts[0] == "fresh":
+                headers = {"Cache-Control": "max-age=60"}
+            return self._send(200, body, headers=headers)
+
+        if parts[0] == "large":
+            size = int(query.get("bytes", ["10000000"])[0])
+            return self._send(200, b"<p>" + b"x" * max(0, size - 7) + b"</p>")
+
+        if parts[0] == "stream":
+            size = int(query.get("bytes", ["10000000"])[0])
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"x" * 65536
+            sent = 0
+            try:
+                while sent < size:
+                    piece = chunk[:min(len(chunk), size - sent)]
+                    self.wfile.write(f"{len(piece):x}\r\n".encode("ascii") + piece + b"\r\n")
+                    sent += len(piece)
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # Client stopped reading at its size cap
+                self.close_connection = True
+            return
+
+        if parts[0] == "image.png":
+            return self._send(200, b"\x89PNG\r\n\x1a\n" + b"\x00" * 1024, content_type="image/png")
+
+        if parts[0] == "slow":
+            time.sleep(float(query.get("seconds", ["1"])[0]))
+            return self._send(200, article_html(0).encode("utf-8"))
+
+        self._send(404, b"not found")
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0):
+    """
+    Start the server on a background thread; returns (server, base_url)
+    """
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="local-http-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def run_checks(base_url: str) -> bool:
+    """
+    Exercise UrlFetcher against the local server and report each behavior
+    """
+    import tempfile
+
+    sys.path.insert(0, BACKEND_DIR)
+    from url_fetcher import ContentTooLarge, HttpCache, UnsupportedContentType, UrlFetcher
+
+    cache_dir = tempfile.mkdtemp(prefix="url_cache_")
+    fetcher = UrlFetcher(max_bytes=1024 * 1024, cache=HttpCache(cache_dir))
+    results = []
+
+    def check(name, passed, detail=""):
+        results.append(passed)
+        print(f"{'✅' if passed else '❌'} {name}{': ' + detail if detail else ''}")
+
+    first = fetcher.fetch(f"{base_url}/article/1")
+    second = fetcher.fetch(f"{base_url}/article/1")
+    check("ETag revalidation", (first.cache_status, second.cache_status) == ("miss", "revalidated"),
+          f"{first.cache_status} -> {second.cache_status}, {Handler.stats['not_modified']} x 304")
+    check("same body after 304", first.text == second.text)
+
+    first = fetcher.fetch(f"{base_url}/fresh/2")
+    requests_before = Handler.stats["requests"]
+    second = fetcher.fetch(f"{base_url}/fresh/2")
+    check("max-age served from disk", second.cache_status == "fresh" and Handler.stats["requests"] == requests_before)
+
+    first = fetcher.fetch(f"{base_url}/nocache/3")
+    second = fetcher.fetch(f"{base_url}/nocache/3")
+    check("no validators, no caching", (first.cache_status, second.cache_status) == ("miss", "miss"))
+
+    for route in ("large", "stream"):
+        try:
+            fetcher.fetch(f"{base_url}/{route}?bytes={5 * 1024 * 1024}")
+            check(f"size cap ({route})", False, "no error raised")
+        except ContentTooLarge as e:
+            check(f"size cap ({route})", True, str(e))
+
+    try:
+        fetcher.fetch(f"{base_url}/image.png")
+        check("content-type rejected", False, "no error raised")
+    except UnsupportedContentType as e:
+        check("content-type rejected", True, str(e))
+
+    started = time.perf_counter()
+    for n in range(50):
+        fetcher.fetch(f"{base_url}/nocache/{n}")
+    pooled = (time.perf_counter() - started) / 50
+    check("pooled fetch", True, f"{pooled * 1000:.2f} ms per page over a reused connection")
+
+    # 1 KiB entries into a 100 KiB cache: a scan about every tenth put once full, not on every put
+    small = HttpCache(tempfile.mkdtemp(prefix="url_cache_small_"), max_bytes=100 * 1024)
+    for n in range(400):
+        small.put(f"{base_url}/small/{n}", {"stored_at": time.time()}, b"x" * 1024)
+    on_disk = sum(os.path.getsize(os.path.join(small.directory, name))
+                  for name in os.listdir(small.directory) if name.endswith(".body"))
+    check("size bound without a scan per put", on_disk <= small.max_bytes and small.scans <= 40,
+          f"{on_disk} bytes on disk, {small.scans} directory scans for 400 puts")
+
+    # A cache directory that cannot be created, like a full or read-only disk
+    blocker = os.path.join(cache_dir, "not-a-directory")
+    with open(blocker, "w") as f:
+        f.write("")
+    broken = UrlFetcher(max_bytes=1024 * 1024, cache=HttpCache(os.path.join(blocker, "cache")))
+    page = broken.fetch(f"{base_url}/article/4")
+    check("unwritable cache is skipped", page.cache_status == "miss" and broken.stats()["cache_errors"] == 1,
+          f"{broken.stats()['cache_errors']} cache error(s)")
+    broken.close()
+
+    print(f"fetcher stats: {fetcher.stats()}")
+    fetcher.close()
+    return all(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--check", action="store_true", help="run the fetcher checks and exit")
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.host, args.port)
+    if args.check:
+        ok = run_checks(base_url)
+        server.shutdown()
+        sys.exit(0 if ok else 1)
+
+    print(f"🌐 Local news server on {base_url} (try {base_url}/article/1)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
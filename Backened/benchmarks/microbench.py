@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks of the hot analysis functions, with a baseline and regression check
+
+Each function runs on small, medium and large inputs:
+- texts of about 300, 3,000 and 10,000 characters (MAX_TEXT_LENGTH);
+- images of 400x200, 1600x900 and 3200x2400 pixels.
+
+Run from the Backened folder after training:
+
+    python benchmarks/microbench.py --save                  # record microbench_baseline.json
+    python benchmarks/microbench.py                         # compare (or save when no baseline exists)
+    python benchmarks/microbench.py --threshold 40 --filter "patterns|clean_text"
+
+Each case is timed over --repeat rounds of at least --min-time seconds, taken
+in turn with the other cases' rounds, and the median round's time per call
+is compared with the baseline's median. A case regresses when it is slower
+by more than its allowed change: --threshold percent (default 25), or twice
+the interquartile spread of its rounds in the baseline or this run when that
+is larger, so noisy cases get a wider margin. Baselines only compare on the
+same machine and settings; a warning is printed when they differ.
+
+OCR used to live in app.extract_text_from_image. It is now
+ocr_worker.ocr_image, which is timed when pytesseract and Tesseract are
+available. Its preprocessing (normalize_image) and the perceptual hash
+(fingerprint_image) are always timed. comprehensive_analysis runs with the
+stub LLM at zero latency and the result cache bypassed, so it measures the
+pipeline's own overhead.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SENTENCES = [
+    "According to officials, the ministry published its annual report on Tuesday",
+    "SHOCKING: doctors hate this one trick that the government is hiding from you",
+    "Visit https://example.com/free-offer to claim your prize before midnight!!!",
+    "The study was published in a peer-reviewed journal by researchers at the university",
+    "All students will receive a free laptop, register your name on the WhatsApp link",
+    "Data from the statistics office showed inflation eased to 4.2% last quarter",
+]
+TEXT_SIZES = {"small": 300, "medium": 3000, "large": 10000}
+IMAGE_SIZES = {"small": (400, 200), "medium": (1600, 900), "large": (3200, 2400)}
+
+
+def make_text(chars):
+    parts, n = [], 0
+    while sum(len(part) + 2 for part in parts) < chars:
+        parts.append(f"{SENTENCES[n % len(SENTENCES)]} ({n})")
+        n += 1
+    return (". ".join(parts) + ".")[:chars]
+
+
+def make_image(size):
+    from PIL import Image, ImageDraw
+    image = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(0, size[1] - 20, 24):
+        draw.text((10, line + 5), SENTENCES[(line // 24) % len(SENTENCES)], fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def calibrate(func, min_time):
+    """
+    Calls per round so that one round takes at least min_time
+    """
+    func()  # warm caches, lazy imports and pools
+    loops = 1
+    while True:
+        elapsed = time_round(func, loops)
+        if elapsed * loops >= min_time:
+            return loops
+        loops = max(loops * 2, int(min_time / max(elapsed, 1e-9) * 1.1))
+
+
+def time_round(func, loops):
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter() - started) / loops
+
+
+def time_cases(cases, repeat, min_time, progress=None):
+    """
+    Median and minimum microseconds per call for each case, and the spread between its rounds
+    (interquartile range / median)
+
+    Rounds are interleaved across cases, so a burst of load from elsewhere on the
+    machine slows one round of several cases instead of every round of one case.
+    """
+    loops = {name: calibrate(func, min_time) for name, func in cases}
+    rounds = {name: [] for name, _ in cases}
+    for n in range(repeat):
+        for name, func in cases:
+            rounds[name].append(time_round(func, loops[name]))
+        if progress:
+            progress(n + 1)
+    results = {}
+    for name, _ in cases:
+        median = statistics.median(rounds[name])
+        lower, _, upper = statistics.quantiles(rounds[name], n=4) if repeat > 1 else (median, median, median)
+        results[name] = {
+            "median_us": round(median * 1e6, 3), "min_us": round(min(rounds[name]) * 1e6, 3),
+            "spread": round((upper - lower) / median, 4) if median else 0.0,
+            "loops": loops[name], "rounds": repeat,
+        }
+    return results
+
+
+def build_cases(app, ocr_worker, tesseract):
+    """
+    (name, zero-argument callable) for every function and input size
+    """
+    loop = asyncio.new_event_loop()
+    cases = []
+    for size, chars in TEXT_SIZES.items():
+        text = make_text(chars)
+        cases += [
+            (f"clean_text[{size}]", lambda text=text: app.clean_text(text)),
+            (f"analyze_with_patterns[{size}]", lambda text=text: app.analyze_with_patterns(text, "Breaking news")),
+            (f"analyze_with_ml[{size}]", lambda text=text: app.analyze_with_ml(text)),
+            (f"analyze_sentiment_and_linguistics[{size}]", lambda text=text: app.analyze_sentiment_and_linguistics(text)),
+            (f"comprehensive_analysis[{size}]", lambda text=text: loop.run_until_complete(
+                app.comprehensive_analysis(text, "Breaking news", "text", use_cache=False))),
+        ]
+    if app.PIL_AVAILABLE:
+        for size, dimensions in IMAGE_SIZES.items():
+            data = make_image(dimensions)
+            cases += [
+                (f"normalize_image[{size}]", lambda data=data: ocr_worker.normalize_image(data)),
+                (f"fingerprint_image[{size}]", lambda data=data: ocr_worker.fingerprint_image(data)),
+            ]
+            if tesseract:
+                cases.append((f"ocr_image[{size}]", lambda data=data: ocr_worker.ocr_image(data)))
+    return cases
+
+
+def tesseract_available():
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def environment(app, config):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": f"{platform.node()} {platform.machine()} ({os.cpu_count()} CPUs)",
+        "settings": {
+            "LINGUISTIC_MODE": config.LINGUISTIC_MODE,
+            "models_loaded": app.rf_model is not None,
+            "model_fingerprint": app.model_fingerprint,
+        },
+    }
+
+
+def allowed_change(before, now, threshold):
+    """
+    Allowed slowdown in percent for one case: threshold, or twice the larger spread between rounds
+    """
+    return max(threshold, 200 * max(before.get("spread", 0.0), now["spread"]))
+
+
+def compare(results, baseline, threshold, statistic):
+    """
+    Print each case against the baseline; returns the names of cases slower than their allowed change
+    """
+    regressions = []
+    print(f"{'case':<48}{'baseline us':>14}{'now us':>12}{'change':>9}{'allowed':>9}")
+    print("-" * 92)
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48}{'-':>14}{result[statistic]:>12.1f}{'new':>9}")
+            continue
+        change = result[statistic] / before[statistic] - 1
+        allowed = allowed_change(before, result, threshold)
+        flag = ""
+        if change * 100 > allowed:
+            regressions.append(name)
+            flag = "  ❌ regression"
+        elif change * 100 < -allowed:
+            flag = "  ✅ faster"
+        print(f"{name:<48}{before[statistic]:>14.1f}{result[statistic]:>12.1f}{change:>+9.1%}{allowed:>8.0f}%{flag}")
+    missing = sorted(set(baseline["results"]) - set(results))
+    if missing:
+        print(f"\nNot run this time: {', '.join(missing)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default="microbench_baseline.json", help="baseline file to write or compare with")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=25.0,
+                        help="allowed slowdown in percent before failing (raised per case for noisy cases)")
+    parser.add_argument("--repeat", type=int, default=7, help="timed rounds per case")
+    parser.add_argument("--statistic", choices=("median", "min"), default="median", help="per-call time compared with the baseline")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds per round")
+    parser.add_argument("--filter", help="regular expression selecting case names")
+    parser.add_argument("--model-dir", default=BACKEND_DIR, help="folder containing the trained model files")
+    parser.add_argument("--json", help="also write this run's results here")
+    args = parser.parse_args()
+
+    os.environ.setdefault("LLM_BACKEND", "stub")
+    os.environ["LLM_STUB_LATENCY_MS"] = "0"
+    # Back-to-back calls would otherwise trip the serving rate limit
+    os.environ["LLM_RATE_PER_SECOND"] = "1000000"
+    os.environ["LLM_BURST"] = "1000000"
+    # Results still go through the store's write queue, just not into the real database
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='microbench_'), 'bench.db')}"
+    baseline_path = os.path.abspath(args.baseline)
+    os.chdir(args.model_dir)
+    sys.path.insert(0, BACKEND_DIR)
+    import app
+    import config
+    import ocr_worker
+
+    app.initialize_models()
+    app.initialize_llm_client()
+    if app.rf_model is None:
+        print("⚠️  No trained model found; analyze_with_ml times its fallback path")
+
+    tesseract = tesseract_available()
+    cases = build_cases(app, ocr_worker, tesseract)
+    if args.filter:
+        pattern = re.compile(args.filter)
+        cases = [(name, func) for name, func in cases if pattern.search(name)]
+    if not tesseract:
+        print("⚠️  Tesseract not available; ocr_image is not timed")
+
+    results = time_cases(cases, args.repeat, args.min_time,
+                         lambda n: print(f"  round {n}/{args.repeat} done", file=sys.stderr))
+    for name, result in results.items():
+        print(f"  {name:<46}{result[f'{args.statistic}_us']:>12.1f} us", file=sys.stderr)
+    run = {"environment": environment(app, config), "threshold": args.threshold, "results": results}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    if args.save or not os.path.exists(baseline_path):
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+        print(f"📄 Baseline written to {baseline_path} ({len(results)} cases)")
+        return 0
+
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    before, now = baseline["environment"], run["environment"]
+    for key in ("python", "machine", "settings"):
+        if before.get(key) != now.get(key):
+            print(f"⚠️  {key} differs from the baseline ({before.get(key)} vs {now.get(key)}); changes may not be comparable")
+    print(f"Comparing with {baseline_path} (commit {before.get('commit')}, threshold {args.threshold:.0f}%)\n")
+    regressions = compare(results, baseline, args.threshold, f"{args.statistic}_us")
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) regressed by more than their allowed change: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No case regressed by more than its allowed change")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
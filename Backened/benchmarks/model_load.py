@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compare model startup time and memory: pickle files vs. memory-mapped artifact
+
+Each loader runs in a fresh interpreter so timings include cold imports.
+Run from the Backened folder after training:
+
+    python benchmarks/model_load.py [--runs 5] [--workers 4]
+
+RSS counts every resident page of the process. PSS splits shared pages
+between the processes mapping them, so with several workers the artifact's
+PSS per worker shrinks while the pickle path stays a private copy each.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADERS = {
+    "pickle": """
+import pickle
+with open("rf_model.pkl", "rb") as f:
+    model = pickle.load(f)
+with open("tfidf_vectorizer.pkl", "rb") as f:
+    vectorizer = pickle.load(f)
+""",
+    "mmap": """
+from model_artifact import load_model_artifact
+vectorizer, model, _ = load_model_artifact("model_artifact")
+""",
+}
+
+CHILD_TEMPLATE = """
+import sys, time, json
+sys.path.insert(0, {backend_dir!r})
+start = time.perf_counter()
+{loader}
+load_seconds = time.perf_counter() - start
+start = time.perf_counter()
+model.predict_proba(vectorizer.transform(["government announces new education policy for students"]))
+first_prediction_seconds = time.perf_counter() - start
+
+def memory_kb(field, path):
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+print(json.dumps({{
+    "load_seconds": load_seconds,
+    "first_prediction_seconds": first_prediction_seconds,
+    "rss_kb": memory_kb("VmRSS", "/proc/self/status"),
+    "pss_kb": memory_kb("Pss", "/proc/self/smaps_rollup"),
+}}))
+sys.stdout.flush()
+# Stay alive until told to exit so sibling workers map the pages concurrently
+sys.stdin.read()
+"""
+
+
+def run_group(mode, workers, model_dir):
+    """Start `workers` loader processes side by side and collect their reports"""
+    code = CHILD_TEMPLATE.format(backend_dir=BACKEND_DIR, loader=LOADERS[mode])
+    processes = [
+        subprocess.Popen([sys.executable, "-c", code], cwd=model_dir,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    reports = [json.loads(process.stdout.readline()) for process in processes]
+    for process in processes:
+        process.communicate("")
+    return reports
+
+
+def summarize(reports):
+    def median(key):
+        values = [report[key] for report in reports if report[key] is not None]
+        return statistics.median(values) if values else None
+    return {
+        "load_seconds": median("load_seconds"),
+        "first_prediction_seconds": median("first_prediction_seconds"),
+        "rss_mb": median("rss_kb") and median("rss_kb") / 1024,
+        "pss_mb": median("pss_kb") and median("pss_kb") / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="cold starts per mode")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent processes for the shared-memory check")
+    parser.add_argument("--model-dir", default=BACKEND_DIR, help="folder containing the trained model files")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results only")
+    args = parser.parse_args()
+
+    missing = [path for path in ("rf_model.pkl", "tfidf_vectorizer.pkl", "model_artifact/manifest.json")
+               if not os.path.exists(os.path.join(args.model_dir, path))]
+    if missing:
+        print(f"❌ Missing model files: {', '.join(missing)}. Run modeltrain.py first.")
+        sys.exit(1)
+
+    results = {}
+    for mode in LOADERS:
+        cold = [run_group(mode, 1, args.model_dir)[0] for _ in range(args.runs)]
+        started = time.perf_counter()
+        shared = run_group(mode, args.workers, args.model_dir)
+        results[mode] = {
+            "cold_start": summarize(cold),
+            f"{args.workers}_workers": summarize(shared),
+            "group_wall_seconds": time.perf_counter() - started,
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<8} {'load ms':>10} {'1st pred ms':>12} {'RSS MB':>9} {'PSS MB':>9} {'PSS MB/worker (x' + str(args.workers) + ')':>24}")
+    for mode, result in results.items():
+        cold = result["cold_start"]
+        shared = result[f"{args.workers}_workers"]
+        print(f"{mode:<8} {cold['load_seconds'] * 1000:>10.1f} {cold['first_prediction_seconds'] * 1000:>12.2f} "
+              f"{cold['rss_mb'] or 0:>9.1f} {cold['pss_mb'] or 0:>9.1f} {shared['pss_mb'] or 0:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cascade policy: decide from the cheap stages whether the LLM is worth calling.
+
+The pattern rules and the RandomForest answer in milliseconds; Gemini takes
+seconds and costs a request. The policy folds the cheap results into one
+fake probability and only escalates to the LLM when that probability falls
+inside the uncertainty band [low, high]. Two shortcuts are decisive on their
+own: several government-scam indicators, and a near-certain ML prediction
+that the pattern rules do not contradict.
+"""
+
+from typing import Any, Dict, Optional
+
+
+def fake_probability(result: Dict[str, Any]) -> float:
+    """
+    Probability that the content is fake, from a {"verdict", "confidence"} stage result
+    """
+    confidence = float(result.get("confidence", 0.5))
+    return confidence if result.get("verdict") == "FAKE" else 1 - confidence
+
+
+class CascadePolicy:
+    """
+    Escalate to the LLM only when the cheap stages are not confident enough
+    """
+
+    def __init__(self, low: float = 0.15, high: float = 0.85, ml_weight: float = 0.6,
+                 ml_decisive: float = 0.97, gov_scam_decisive: int = 2):
+        if not 0 <= low < high <= 1:
+            raise ValueError("Cascade band must satisfy 0 <= low < high <= 1")
+        self.low = low
+        self.high = high
+        self.ml_weight = ml_weight
+        self.ml_decisive = ml_decisive
+        self.gov_scam_decisive = gov_scam_decisive
+
+    def describe(self) -> str:
+        return f"band={self.low}-{self.high},ml={self.ml_weight}/{self.ml_decisive},gov={self.gov_scam_decisive}"
+
+    def decide(self, patterns: Optional[Dict[str, Any]], ml: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Returns the decision: escalated, the cheap fake probability, the verdict and
+        confidence that stand in for the LLM when it is skipped, and the reason
+        """
+        patterns_usable = patterns is not None and patterns.get("verdict") in ("FAKE", "REAL")
+        ml_usable = ml is not None and ml.get("verdict") in ("FAKE", "REAL") and ml.get("ml_analysis", "").startswith("Random Forest")
+
+        if not patterns_usable and not ml_usable:
+            return self._decision(True, 0.5, "no usable cheap stage results")
+
+        if patterns_usable:
+            # Distinct indicators, as analyze_with_patterns counts them: one keyword repeated is one indicator
+            gov_scam_hits = len({hit["indicator"] for hit in patterns.get("indicator_hits", [])
+                                 if "gov_scam" in hit["categories"]})
+            if gov_scam_hits >= self.gov_scam_decisive:
+                return self._decision(False, max(fake_probability(patterns), self.high),
+                                      f"{gov_scam_hits} government scam indicators")
+
+        if ml_usable and ml["confidence"] >= self.ml_decisive:
+            # Pattern rules that found nothing, or agree, do not contradict the model
+            if not patterns_usable or not patterns.get("indicator_hits") or patterns["verdict"] == ml["verdict"]:
+                return self._decision(False, fake_probability(ml),
+                                      f"Random Forest is {ml['confidence']:.2f} confident")
+
+        if patterns_usable and ml_usable:
+            probability = self.ml_weight * fake_probability(ml) + (1 - self.ml_weight) * fake_probability(patterns)
+        elif ml_usable:
+            probability = fake_probability(ml)
+        else:
+            probability = fake_probability(patterns)
+
+        if self.low < probability < self.high:
+            return self._decision(True, probability, f"cheap stages uncertain (p_fake={probability:.2f})")
+        return self._decision(False, probability, f"cheap stages decisive (p_fake={probability:.2f})")
+
+    def _decision(self, escalated: bool, probability: float, reason: str) -> Dict[str, Any]:
+        return {
+            "escalated": escalated,
+            "fake_probability": round(probability, 4),
+            "verdict": "FAKE" if probability >= 0.5 else "REAL",
+            "confidence": round(max(probability, 1 - probability), 4),
+            "band": [self.low, self.high],
+            "reason": reason,
+        }
@@ -0,0 +1,168 @@
+"""
+Long-document support: overlapping chunks and a streaming aggregate of their scores.
+
+iter_chunks() slices the text lazily into overlapping windows that end on a
+sentence (or at least word) boundary. ChunkAggregate folds per-chunk scores
+into a length-weighted fake probability as they arrive, keeps only the k
+most suspicious chunks, and tells the caller when the verdict is decisive
+enough to stop scoring the rest of the document.
+"""
+
+import heapq
+import re
+from typing import Any, Dict, Iterator, List, NamedTuple
+
+SENTENCE_END = re.compile(r"[.!?]['\")\]]?\s|\n")
+PASSAGE_CHARS = 320
+
+
+class Chunk(NamedTuple):
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+class ChunkScore(NamedTuple):
+    chunk: Chunk
+    fake_probability: float  # ML probability that the chunk is fake
+    suspicion: float  # fake_probability adjusted by the indicators found in the chunk
+    indicators: List[str]
+    first_hit: int  # offset of the first suspicious indicator within the chunk, or -1
+
+
+def _boundary(text: str, start: int, end: int) -> int:
+    """
+    Move end back to the last sentence end in the window's final third, else to whitespace
+    """
+    if end >= len(text):
+        return len(text)
+    floor = start + (end - start) * 2 // 3
+    last = None
+    for match in SENTENCE_END.finditer(text, floor, end):
+        last = match.end()
+    if last is not None:
+        return last
+    space = text.rfind(" ", floor, end)
+    return space + 1 if space > 0 else end
+
+
+def iter_chunks(text: str, chunk_chars: int = 4000, overlap_chars: int = 400) -> Iterator[Chunk]:
+    """
+    Yield overlapping chunks of at most chunk_chars characters
+    """
+    if overlap_chars >= chunk_chars:
+        raise ValueError("overlap_chars must be smaller than chunk_chars")
+    start = 0
+    index = 0
+    while start < len(text):
+        end = _boundary(text, start, start + chunk_chars)
+        yield Chunk(index, start, end, text[start:end])
+        if end >= len(text):
+            return
+        index += 1
+        # Step back by the overlap, then forward to a word start so no word is cut
+        next_start = max(end - overlap_chars, start + 1)
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
+
+
+def passage(score: ChunkScore, max_chars: int = PASSAGE_CHARS) -> Dict[str, Any]:
+    """
+    A short excerpt of a chunk, centred on its first suspicious indicator when it has one
+    """
+    text = score.chunk.text
+    begin = 0
+    if score.first_hit > 0:
+        # Start at the sentence containing the indicator when it is close enough
+        window_start = max(0, score.first_hit - max_chars // 2)
+        sentence_start = None
+        for match in SENTENCE_END.finditer(text, window_start, score.first_hit):
+            sentence_start = match.end()
+        if sentence_start is not None:
+            begin = sentence_start
+        else:
+            begin = text.rfind(" ", 0, max(0, score.first_hit - max_chars // 4)) + 1
+    excerpt = text[begin:begin + max_chars]
+    truncated = begin + max_chars < len(text)
+    if truncated and excerpt.rfind(" ") > 0:
+        excerpt = excerpt[:excerpt.rfind(" ")]
+    return {
+        "chunk": score.chunk.index,
+        "start": score.chunk.start + begin,
+        "end": score.chunk.start + begin + len(excerpt),
+        "passage": excerpt.strip() + ("…" if truncated else ""),
+        "suspicion": round(score.suspicion, 3),
+        "fake_probability": round(score.fake_probability, 3),
+        "indicators": score.indicators,
+    }
+
+
+class ChunkAggregate:
+    """
+    Running aggregate of chunk scores; memory is bounded by top_k
+    """
+
+    def __init__(self, top_k: int = 3):
+        self.top_k = top_k
+        self.chunks_scored = 0
+        self.chars_scored = 0
+        self.max_fake_probability = 0.0
+        self._weighted_sum = 0.0
+        self._first = None
+        self._top: List[tuple] = []  # min-heap of (suspicion, index, score)
+
+    def add(self, score: ChunkScore) -> None:
+        weight = len(score.chunk.text)
+        self.chunks_scored += 1
+        self.chars_scored += weight
+        self._weighted_sum += score.fake_probability * weight
+        self.max_fake_probability = max(self.max_fake_probability, score.fake_probability)
+        if self._first is None:
+            self._first = score
+        entry = (score.suspicion, -score.chunk.index, score)
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, entry)
+        elif entry[:2] > self._top[0][:2]:
+            heapq.heapreplace(self._top, entry)
+
+    @property
+    def fake_probability(self) -> float:
+        return self._weighted_sum / self.chars_scored if self.chars_scored else 0.0
+
+    def is_decisive(self, min_chunks: int, threshold: float) -> bool:
+        """
+        True once enough chunks agree strongly that scoring the rest cannot change the verdict
+        """
+        if self.chunks_scored < min_chunks:
+            return False
+        probability = self.fake_probability
+        return probability >= threshold or probability <= 1 - threshold
+
+    def top_scores(self) -> List[ChunkScore]:
+        return [score for _, _, score in sorted(self._top, reverse=True)]
+
+    def condensed_text(self, max_chars: int) -> str:
+        """
+        Opening chunk plus the most suspicious chunks in document order, within max_chars
+        """
+        # Opening first, then most suspicious, so they survive the length cap; reading order is restored below
+        ranked = [self._first.chunk] if self._first is not None else []
+        ranked += [score.chunk for score in self.top_scores() if not ranked or score.chunk.index != ranked[0].index]
+        kept, used = [], 0
+        for chunk in ranked:
+            room = max_chars - used
+            if room <= 0:
+                break
+            kept.append(chunk._replace(text=chunk.text[:room]))
+            used += min(len(chunk.text), room) + 2
+        return "\n\n".join(chunk.text for chunk in sorted(kept, key=lambda chunk: chunk.index))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "chunks_scored": self.chunks_scored,
+            "chars_scored": self.chars_scored,
+            "fake_probability": round(self.fake_probability, 3),
+            "max_chunk_fake_probability": round(self.max_fake_probability, 3),
+            "highlights": [passage(score) for score in self.top_scores()],
+        }
@@ -8,12 +8,55 @@ API_HOST = "0.0.0.0"
 API_PORT = 8000
 DEBUG = True
 
+# Metrics: Prometheus text format at /metrics (request, stage and cache counters per worker)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Request Timings: Server-Timing header on every response; analysis.timings is added when
+# TIMINGS_IN_RESPONSE is set or the request sends X-Debug-Timings: 1
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+TIMINGS_IN_RESPONSE = os.getenv("TIMINGS_IN_RESPONSE", "false").lower() in ("1", "true", "yes")
+
+# Admin Endpoints (/admin/profiling/...): require the X-Admin-Token header; disabled while empty
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0.05"))  # default share of analyze requests profiled
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "600"))  # sampling switches itself off after this
+
 # Google Gemini Configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-pro")
+
+# LLM Backend: "gemini" for the real API, "stub" for offline runs and benchmarks
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+LLM_STUB_LATENCY_MS = float(os.getenv("LLM_STUB_LATENCY_MS", "0"))
+
+# LLM Admission Control: calls beyond these limits, or while the circuit breaker is open,
+# fall back to pattern analysis immediately instead of waiting on the API
+LLM_RATE_PER_SECOND = float(os.getenv("LLM_RATE_PER_SECOND", "5"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_MIN_IN_FLIGHT = int(os.getenv("LLM_MIN_IN_FLIGHT", "1"))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "8"))
+LLM_TARGET_LATENCY_SECONDS = float(os.getenv("LLM_TARGET_LATENCY_SECONDS", "5"))  # concurrency shrinks above 2x this
+LLM_CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "10"))
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))  # consecutive failures that open the circuit
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
 
 # Model Configuration
 MODEL_PATH = "rf_model.pkl"
 VECTORIZER_PATH = "tfidf_vectorizer.pkl"
+MODEL_ARTIFACT_DIR = os.getenv("MODEL_ARTIFACT_DIR", "model_artifact")  # memory-mapped serving format from modeltrain.py
+
+# Linguistic Analysis (spaCy)
+# full: complete pipeline; lean: tagger + NER + statistical sentence splitter
+# (no parser/lemmatizer); minimal: tokenizer + rule-based sentencizer only (no POS/entities)
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+LINGUISTIC_MODE = os.getenv("LINGUISTIC_MODE", "lean").lower()
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+
+# Startup: NLTK data is looked up in this folder first, then NLTK's usual locations
+# (no downloads at runtime), and models load in the background while the server
+# already accepts connections
+NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "nltk_data"))
+BACKGROUND_WARMUP = os.getenv("BACKGROUND_WARMUP", "true").lower() in ("1", "true", "yes")
 
 # CORS Configuration
 ALLOWED_ORIGINS = [
@@ -23,15 +66,94 @@ ALLOWED_ORIGINS = [
     "http://127.0.0.1:3001"
 ]
 
+# URL Fetching: pooled connections, streamed size cap and on-disk conditional-GET cache
+URL_FETCH_TIMEOUT = float(os.getenv("URL_FETCH_TIMEOUT", "15"))
+URL_FETCH_MAX_BYTES = int(os.getenv("URL_FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
+URL_ALLOWED_CONTENT_TYPES = [t.strip() for t in os.getenv(
+    "URL_ALLOWED_CONTENT_TYPES", "text/html,application/xhtml+xml,text/plain").split(",") if t.strip()]
+URL_CACHE_DIR = os.getenv("URL_CACHE_DIR", "url_cache")  # empty to disable the disk cache
+URL_CACHE_MAX_BYTES = int(os.getenv("URL_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
 # Analysis Configuration
 MIN_CONFIDENCE_THRESHOLD = 0.6
 MAX_TEXT_LENGTH = 10000
+
+# Long Documents: text over MAX_TEXT_LENGTH is scored in overlapping chunks and only the
+# opening plus the most suspicious chunks (up to MAX_TEXT_LENGTH) go through the full pipeline
+LONG_DOC_MAX_CHARS = int(os.getenv("LONG_DOC_MAX_CHARS", "500000"))
+LONG_DOC_CHUNK_CHARS = int(os.getenv("LONG_DOC_CHUNK_CHARS", "4000"))
+LONG_DOC_CHUNK_OVERLAP = int(os.getenv("LONG_DOC_CHUNK_OVERLAP", "400"))
+LONG_DOC_CHUNK_BATCH = int(os.getenv("LONG_DOC_CHUNK_BATCH", "8"))  # chunks scored per ML call
+LONG_DOC_MIN_CHUNKS = int(os.getenv("LONG_DOC_MIN_CHUNKS", "8"))  # scored before stopping early
+LONG_DOC_DECISIVE_PROBABILITY = float(os.getenv("LONG_DOC_DECISIVE_PROBABILITY", "0.85"))
+LONG_DOC_HIGHLIGHTS = int(os.getenv("LONG_DOC_HIGHLIGHTS", "3"))
 MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
 
+# OCR: images are normalized (grayscale, long side <= OCR_MAX_SIDE) and read by Tesseract
+# in the process pool; new jobs are refused while OCR_MAX_QUEUE jobs are already waiting
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "2000"))
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", "40000000"))
+OCR_MAX_QUEUE = int(os.getenv("OCR_MAX_QUEUE", "16"))
+OCR_LANG = os.getenv("OCR_LANG", "eng")
+
+# OCR reuse: images whose 256-bit dHash is within IMAGE_HASH_MAX_DISTANCE bits of an
+# already OCR'd image reuse its text (0 = identical hashes only)
+IMAGE_HASH_MAX_ENTRIES = int(os.getenv("IMAGE_HASH_MAX_ENTRIES", "5000"))
+IMAGE_HASH_MAX_DISTANCE = int(os.getenv("IMAGE_HASH_MAX_DISTANCE", "18"))
+IMAGE_HASH_TTL_SECONDS = float(os.getenv("IMAGE_HASH_TTL_SECONDS", "86400"))
+
+# ML Micro-Batching (concurrent single-text requests share one predict_proba call)
+ML_BATCH_WINDOW_MS = float(os.getenv("ML_BATCH_WINDOW_MS", "3"))
+ML_BATCH_MAX_SIZE = int(os.getenv("ML_BATCH_MAX_SIZE", "64"))
+
+# Batch Analysis
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "500"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+
+# Execution Pools (blocking work is kept off the event loop)
+IO_POOL_SIZE = int(os.getenv("IO_POOL_SIZE", "32"))
+CPU_POOL_SIZE = int(os.getenv("CPU_POOL_SIZE", str(os.cpu_count() or 2)))
+PROCESS_POOL_SIZE = int(os.getenv("PROCESS_POOL_SIZE", "2"))
+PROCESS_POOL_START_METHOD = os.getenv("PROCESS_POOL_START_METHOD", "spawn")
+
+# Production Serving (run_server.py --production): pre-forked workers sharing preloaded models
+WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 2)))
+GRACEFUL_TIMEOUT = float(os.getenv("GRACEFUL_TIMEOUT", "30"))  # seconds a worker gets to finish in-flight requests
+
+# Analysis Deadlines (seconds); stages that miss their budget are skipped
+ANALYSIS_DEADLINE_SECONDS = float(os.getenv("ANALYSIS_DEADLINE_SECONDS", "25"))
+STAGE_TIMEOUTS = {
+    "llm": float(os.getenv("LLM_STAGE_TIMEOUT", "20")),
+    "ml": float(os.getenv("ML_STAGE_TIMEOUT", "5")),
+    "sentiment": float(os.getenv("SENTIMENT_STAGE_TIMEOUT", "10")),
+    "evidence": float(os.getenv("EVIDENCE_STAGE_TIMEOUT", "5")),
+}
+
+# LLM Cascade: patterns and ML run first; the LLM is only called when their combined
+# fake probability falls inside (CASCADE_LOW, CASCADE_HIGH) - see benchmarks/cascade_replay.py
+CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "false").lower() in ("1", "true", "yes")
+CASCADE_LOW = float(os.getenv("CASCADE_LOW", "0.15"))
+CASCADE_HIGH = float(os.getenv("CASCADE_HIGH", "0.85"))
+CASCADE_ML_WEIGHT = float(os.getenv("CASCADE_ML_WEIGHT", "0.6"))
+CASCADE_ML_DECISIVE = float(os.getenv("CASCADE_ML_DECISIVE", "0.97"))  # ML confidence that skips the LLM on its own
+CASCADE_GOV_SCAM_DECISIVE = int(os.getenv("CASCADE_GOV_SCAM_DECISIVE", "2"))
+
+# Result Cache (bump ANALYSIS_VERSION when analysis logic changes)
+ANALYSIS_VERSION = os.getenv("ANALYSIS_VERSION", "1")
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64MB
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+
 # External APIs (for evidence gathering)
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY", "")
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID", "")
 REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET", "")
 
-# Database Configuration (if needed)
+# Database Configuration: analyses are persisted here as a second-level cache shared by workers
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fakenews.db")
+ANALYSIS_STORE_ENABLED = os.getenv("ANALYSIS_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+ANALYSIS_STORE_TTL_SECONDS = float(os.getenv("ANALYSIS_STORE_TTL_SECONDS", str(7 * 86400)))
+ANALYSIS_STORE_QUEUE_MAX = int(os.getenv("ANALYSIS_STORE_QUEUE_MAX", "10000"))  # results waiting to be written; more are dropped
+ANALYSIS_STORE_QUEUE_MAX_BYTES = int(os.getenv("ANALYSIS_STORE_QUEUE_MAX_BYTES", str(64 * 1024 * 1024)))  # same, by payload size
+ANALYSIS_STORE_BATCH_SIZE = int(os.getenv("ANALYSIS_STORE_BATCH_SIZE", "256"))
+ANALYSIS_STORE_FLUSH_MS = float(os.getenv("ANALYSIS_STORE_FLUSH_MS", "200"))
@@ -0,0 +1,139 @@
+"""
+Bounded worker pools for running blocking work off the event loop.
+
+The analyze endpoints are async, but the stages they call (HTTP fetches,
+Gemini, spaCy, scikit-learn, Tesseract) block. Each kind of work gets its own
+bounded pool so a slow stage can only exhaust its own pool and the event loop
+stays free to serve other requests and health probes.
+"""
+
+import asyncio
+import contextvars
+import multiprocessing
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import config
+from profiling import run_profiled
+
+
+class WorkerPool:
+    """
+    Lazily created thread or process pool with in-flight accounting.
+
+    The executor is only created on first use, so a pool object can be
+    defined at import time and still be safe to use after a fork.
+    """
+
+    def __init__(self, name: str, max_workers: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown pool kind: {kind}")
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "thread":
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix=f"{self.name}-pool",
+                        )
+                    else:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context(config.PROCESS_POOL_START_METHOD),
+                        )
+        return self._executor
+
+    def _on_done(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Submit func to the pool and return a concurrent.futures.Future
+        """
+        executor = self._get_executor()
+        with self._lock:
+            self._in_flight += 1
+        try:
+            if self.kind == "thread":
+                # Carry contextvars into the worker thread like asyncio.to_thread
+                # (request timings, and profiling when the request is sampled)
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, run_profiled, func, *args, **kwargs)
+            else:
+                future = executor.submit(func, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func in the pool and await its result without blocking the loop
+        """
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self._completed
+        active = min(in_flight, self.max_workers)
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "active": active,
+            "queued": in_flight - active,
+            "completed": completed,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+# Blocking network I/O (URL fetches, Gemini calls)
+io_pool = WorkerPool("io", config.IO_POOL_SIZE)
+
+# CPU-bound work on in-process models (scikit-learn, spaCy, NLTK)
+cpu_pool = WorkerPool("cpu", config.CPU_POOL_SIZE)
+
+# CPU-bound work on picklable inputs that benefits from separate processes (OCR)
+process_pool = WorkerPool("process", config.PROCESS_POOL_SIZE, kind="process")
+
+POOLS = (io_pool, cpu_pool, process_pool)
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    return await io_pool.run(func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    return await cpu_pool.run(func, *args, **kwargs)
+
+
+async def run_in_process(func: Callable, *args, **kwargs) -> Any:
+    return await process_pool.run(func, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {pool.name: pool.stats() for pool in POOLS}
+
+
+def shutdown_pools(wait: bool = True) -> None:
+    for pool in POOLS:
+        pool.shutdown(wait=wait)
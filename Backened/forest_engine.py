@@ -0,0 +1,131 @@
+"""
+Compact array-backed inference for the trained RandomForest.
+
+export_forest() flattens every tree of a fitted RandomForestClassifier into a
+handful of contiguous NumPy arrays; CompactForest evaluates all trees at once
+against TF-IDF rows without sklearn's per-call validation or joblib dispatch.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+FOREST_FORMAT_VERSION = 1
+
+
+def export_forest(rf_model) -> Dict[str, np.ndarray]:
+    """
+    Flatten a fitted RandomForestClassifier into contiguous arrays.
+
+    Node ids are global across trees. children[node] holds the (left, right)
+    successors; leaves point to themselves on both sides so evaluation can
+    run a fixed number of steps. Each node stores its normalized class
+    distribution.
+    """
+    features, thresholds, children, values, roots, leaves = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in rf_model.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count, dtype=np.int32) + offset
+        is_leaf = tree.children_left < 0
+
+        feature = tree.feature.astype(np.int32)
+        feature[is_leaf] = 0
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+        value = tree.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+
+        features.append(feature)
+        thresholds.append(tree.threshold.astype(np.float64))
+        children.append(np.stack([left, right], axis=1).astype(np.int32))
+        values.append((value / totals).astype(np.float32))
+        leaves.append(is_leaf)
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+
+    return {
+        "format_version": np.array(FOREST_FORMAT_VERSION, dtype=np.int32),
+        "feature": np.concatenate(features),
+        "threshold": np.concatenate(thresholds),
+        "children": np.concatenate(children),
+        "value": np.concatenate(values),
+        "roots": np.array(roots, dtype=np.int32),
+        "is_leaf": np.concatenate(leaves),
+        "classes": np.asarray(rf_model.classes_),
+        "n_features": np.array(rf_model.n_features_in_, dtype=np.int32),
+        "max_depth": np.array(max_depth, dtype=np.int32),
+    }
+
+
+class CompactForest:
+    """
+    Drop-in replacement for RandomForestClassifier.predict_proba / classes_.
+
+    The arrays may be read-only memory maps (see model_artifact.py).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        version = int(arrays["format_version"])
+        if version != FOREST_FORMAT_VERSION:
+            raise ValueError(f"Unsupported forest format version: {version}")
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.classes_ = arrays["classes"]
+        self.n_features_in_ = int(arrays["n_features"])
+        self.max_depth = int(arrays["max_depth"])
+        self.is_leaf = arrays["is_leaf"]
+        self._successors = self.children.reshape(-1)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.feature, self.threshold, self.children,
+                                              self.value, self.roots, self.is_leaf))
+
+    def predict_proba(self, X, chunk_size: int = 256) -> np.ndarray:
+        """
+        Average per-tree class distributions for each row of X (sparse CSR or dense)
+        """
+        n_rows = X.shape[0]
+        proba = np.empty((n_rows, len(self.classes_)), dtype=np.float64)
+        for start in range(0, n_rows, chunk_size):
+            stop = min(start + chunk_size, n_rows)
+            proba[start:stop] = self._predict_dense(self._densify(X, start, stop))
+        return proba
+
+    def _densify(self, X, start: int, stop: int) -> np.ndarray:
+        # sklearn compares float32 feature values against float64 thresholds
+        dense = np.zeros((stop - start, self.n_features_in_), dtype=np.float32)
+        if hasattr(X, "indptr"):
+            # Scatter CSR rows directly; much cheaper than slicing + toarray()
+            lo, hi = X.indptr[start], X.indptr[stop]
+            rows = np.repeat(np.arange(stop - start), np.diff(X.indptr[start:stop + 1]))
+            dense[rows, X.indices[lo:hi]] = X.data[lo:hi]
+        else:
+            dense[:] = np.asarray(X[start:stop])
+        return dense
+
+    def _predict_dense(self, dense: np.ndarray) -> np.ndarray:
+        n_rows, n_features = dense.shape
+        n_trees = len(self.roots)
+        flat = dense.reshape(-1)
+        nodes = np.tile(self.roots, n_rows)
+        # Offset of each (row, tree) slot into the flattened rows; not needed for one row
+        row_base = np.repeat(np.arange(n_rows) * n_features, n_trees) if n_rows > 1 else 0
+        for step in range(self.max_depth):
+            go_right = flat[self.feature[nodes] + row_base] > self.threshold[nodes]
+            nodes = self._successors[2 * nodes + go_right]
+            # Most paths end well before max_depth; checking occasionally keeps the loop lean
+            if step % 8 == 7 and self.is_leaf[nodes].all():
+                break
+        return self.value[nodes].reshape(n_rows, n_trees, -1).mean(axis=1, dtype=np.float64)
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
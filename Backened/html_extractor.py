@@ -0,0 +1,270 @@
+"""
+Main-content extraction from HTML pages.
+
+A single incremental html.parser pass drops scripts, styles and boilerplate
+(navigation, footers, cookie banners, share widgets...), collects title and
+meta tags, and splits the remaining text into blocks. The article body is
+then chosen as the container with the most paragraph text, favouring
+<article>/<main> when they hold enough text, so only the story itself is
+sent to the LLM, the TF-IDF model and spaCy.
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional
+
+# Content never shown as article text
+SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "footer", "aside", "form", "button", "select", "textarea", "head",
+})
+# Elements that can hold the article body
+CONTAINER_TAGS = frozenset({"body", "article", "main", "section", "div", "td"})
+# Elements whose text forms a paragraph of its own
+BLOCK_TAGS = frozenset({
+    "p", "li", "blockquote", "pre", "h1", "h2", "h3", "h4", "h5", "h6",
+    "dd", "dt", "figcaption", "tr", "br", "hr",
+}) | CONTAINER_TAGS
+VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+})
+BOILERPLATE_PATTERN = re.compile(
+    r"cookie|consent|banner|gdpr|\bnav|menu|footer|header|sidebar|share|social|comment|related|"
+    r"advert|\bads?\b|promo|sponsor|newsletter|subscribe|popup|modal|breadcrumb|widget|outbrain|taboola",
+    re.IGNORECASE,
+)
+ARTICLE_HINT_PATTERN = re.compile(r"article|story|post-body|entry-content|content-body|main-content", re.IGNORECASE)
+META_FIELDS = {
+    "description": "description",
+    "og:description": "description",
+    "og:title": "og_title",
+    "og:site_name": "site_name",
+    "author": "author",
+    "article:author": "author",
+    "article:published_time": "published_time",
+    "date": "published_time",
+}
+MIN_MAIN_CHARS = 200
+WHITESPACE = re.compile(r"\s+")
+
+
+class ExtractedPage(NamedTuple):
+    text: str
+    title: Optional[str]
+    meta: Dict[str, str]
+    input_chars: int
+    kept_chars: int
+
+    @property
+    def discarded_chars(self) -> int:
+        return self.input_chars - self.kept_chars
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "input_chars": self.input_chars,
+            "kept_chars": self.kept_chars,
+            "discarded_chars": self.discarded_chars,
+            "reduction": round(self.input_chars / self.kept_chars, 1) if self.kept_chars else None,
+        }
+
+
+class _Container:
+    __slots__ = ("tag", "parent", "start", "end", "paragraph_chars", "link_chars", "preferred")
+
+    def __init__(self, tag: str, parent: Optional[int], start: int, preferred: bool):
+        self.tag = tag
+        self.parent = parent
+        self.start = start  # first block index inside this container
+        self.end = None  # one past the last block; None while still open
+        self.paragraph_chars = 0
+        self.link_chars = 0
+        self.preferred = preferred
+
+
+class MainContentParser(HTMLParser):
+    """
+    Incremental parser; call feed() with chunks, then result()
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.input_chars = 0
+        self.title_parts: List[str] = []
+        self.first_heading: Optional[str] = None
+        self.meta: Dict[str, str] = {}
+        self.blocks: List[str] = []  # finished text blocks, in document order
+        self.containers: List[_Container] = [_Container("document", None, 0, False)]
+        self._stack: List[tuple] = []  # (tag, skipping, container index or None)
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._in_title = False
+        self._in_heading = False
+        self._current: List[str] = []
+        self._current_link_chars = 0
+
+    def feed(self, data: str) -> None:
+        self.input_chars += len(data)
+        super().feed(data)
+
+    # Parser callbacks
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            self._handle_meta(dict(attrs))
+            return
+        if tag == "title":
+            self._in_title = True
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+
+        attributes = dict(attrs)
+        marker = f"{attributes.get('class') or ''} {attributes.get('id') or ''} {attributes.get('role') or ''}"
+        skipping = (tag in SKIP_TAGS or attributes.get("aria-hidden") == "true" or "hidden" in attributes
+                    or (tag not in ("html", "body", "article", "main") and BOILERPLATE_PATTERN.search(marker) is not None
+                        and not ARTICLE_HINT_PATTERN.search(marker)))
+        if skipping:
+            self._skip_depth += 1
+
+        container = None
+        if tag in CONTAINER_TAGS and not self._skip_depth:
+            preferred = (tag in ("article", "main") or attributes.get("role") == "main"
+                         or attributes.get("itemprop") == "articleBody")
+            container = len(self.containers)
+            self.containers.append(_Container(tag, self._container_index(), len(self.blocks), preferred))
+        if tag == "a":
+            self._link_depth += 1
+        if tag in ("h1", "h2"):
+            self._in_heading = True
+        self._stack.append((tag, skipping, container))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and tag not in ("meta", "title"):
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+            return
+        if tag in VOID_TAGS:
+            return
+        # Close any unclosed children (e.g. <p> without </p>); ignore stray end tags
+        if not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, skipping, container = self._stack[-1]
+            # Flush while the element is still open so its text is owned by it
+            if open_tag in BLOCK_TAGS:
+                self._flush()
+            self._stack.pop()
+            if skipping:
+                self._skip_depth -= 1
+            if container is not None:
+                self.containers[container].end = len(self.blocks)
+            if open_tag == "a":
+                self._link_depth -= 1
+            if open_tag in ("h1", "h2"):
+                self._in_heading = False
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+            return
+        if self._skip_depth:
+            return
+        self._current.append(data)
+        if self._link_depth:
+            self._current_link_chars += len(data.strip())
+
+    # Helpers
+
+    def _container_index(self) -> int:
+        for _, _, container in reversed(self._stack):
+            if container is not None:
+                return container
+        return 0
+
+    def _handle_meta(self, attributes: Dict[str, Optional[str]]) -> None:
+        key = (attributes.get("property") or attributes.get("name") or "").lower()
+        field = META_FIELDS.get(key)
+        content = attributes.get("content")
+        if field and content and field not in self.meta:
+            self.meta[field] = WHITESPACE.sub(" ", content).strip()
+
+    def _flush(self) -> None:
+        if not self._current:
+            return
+        text = WHITESPACE.sub(" ", "".join(self._current)).strip()
+        link_chars = self._current_link_chars
+        self._current = []
+        self._current_link_chars = 0
+        if not text:
+            return
+        owner = self._container_index()
+        self.blocks.append(text)
+        container = self.containers[owner]
+        container.paragraph_chars += len(text)
+        container.link_chars += link_chars
+        if self._in_heading and self.first_heading is None:
+            self.first_heading = text
+
+    # Result
+
+    def result(self) -> ExtractedPage:
+        self.close()
+        self._flush()
+        for container in self.containers:
+            if container.end is None:
+                container.end = len(self.blocks)
+
+        start, end = self._main_range()
+        text = "\n".join(self.blocks[start:end])
+        title = (self.meta.get("og_title") or WHITESPACE.sub(" ", "".join(self.title_parts)).strip()
+                 or self.first_heading or None)
+        return ExtractedPage(text, title, self.meta, self.input_chars, len(text))
+
+    def _main_range(self):
+        """
+        Block range of the article body: the best container by paragraph text,
+        scored like Readability (full score to the parent, half to the grandparent)
+        """
+        scores = [0.0] * len(self.containers)
+        for index, container in enumerate(self.containers):
+            if not container.paragraph_chars:
+                continue
+            link_density = container.link_chars / container.paragraph_chars
+            score = container.paragraph_chars * (1 - min(link_density, 1.0))
+            scores[index] += score
+            parent = container.parent
+            if parent is not None:
+                scores[parent] += score / 2
+
+        def subtree_chars(container):
+            return sum(len(block) for block in self.blocks[container.start:container.end])
+
+        preferred = [c for c in self.containers if c.preferred and subtree_chars(c) >= MIN_MAIN_CHARS]
+        if preferred:
+            best = max(preferred, key=subtree_chars)
+            return best.start, best.end
+
+        best_index = max(range(len(self.containers)), key=scores.__getitem__)
+        best = self.containers[best_index]
+        if scores[best_index] <= 0 or subtree_chars(best) < MIN_MAIN_CHARS:
+            # Short or unstructured page: keep all non-boilerplate text
+            return 0, len(self.blocks)
+        return best.start, best.end
+
+
+def extract_main_content(html: str) -> ExtractedPage:
+    """
+    Extract the article text, title and meta tags from an HTML page
+    """
+    parser = MainContentParser()
+    parser.feed(html)
+    return parser.result()
@@ -0,0 +1,123 @@
+"""
+Perceptual-hash index of images that have already been OCR'd.
+
+Forwarded screenshots come back re-encoded, resized or slightly cropped, so
+their bytes differ but their 256-bit difference hash (dHash) stays within a
+few bits. Each OCR result is stored under its dHash; a new image whose hash
+is within max_distance bits of a stored one reuses that text instead of
+running Tesseract again. The index is bounded by entry count and age and
+evicts the least recently used entries first.
+
+Screenshots of text share a similar layout, which is why the hash is 16x16
+rather than the usual 8x8: at 8x8 two different chat screenshots routinely
+hash identically.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+HASH_SIZE = 16  # 16x16 gradients -> 256-bit hash
+
+
+def dhash(image, hash_size: int = HASH_SIZE) -> int:
+    """
+    Difference hash of a PIL image: one bit per horizontally adjacent pixel pair
+    """
+    from PIL import Image
+
+    # LANCZOS averages over the whole source area, so JPEG noise barely moves the gradients
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for column in range(hash_size):
+            value = (value << 1) | (pixels[offset + column] > pixels[offset + column + 1])
+    return value
+
+
+if hasattr(int, "bit_count"):
+    def hamming_distance(a: int, b: int) -> int:
+        return (a ^ b).bit_count()
+else:  # Python < 3.10
+    def hamming_distance(a: int, b: int) -> int:
+        return bin(a ^ b).count("1")
+
+
+class ImageHashIndex:
+    """
+    Thread-safe LRU + TTL map from dHash to OCR result with nearest-match lookup
+    """
+
+    def __init__(self, max_entries: int = 5000, max_distance: int = 18, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, image_hash: int) -> Optional[Tuple[Dict[str, Any], int]]:
+        """
+        Closest stored result within max_distance bits; returns (result, distance) or None
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(image_hash)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(image_hash)
+                self.exact_hits += 1
+                return dict(entry[0]), 0
+
+            best_hash, best_distance = None, self.max_distance + 1
+            expired = []
+            # A linear scan: about 2 ms for 5000 entries, against seconds for an OCR run
+            for stored_hash, (_, expires_at) in self._entries.items():
+                if expires_at <= now:
+                    expired.append(stored_hash)
+                    continue
+                distance = hamming_distance(image_hash, stored_hash)
+                if distance < best_distance:
+                    best_hash, best_distance = stored_hash, distance
+            for stored_hash in expired:
+                del self._entries[stored_hash]
+
+            if best_hash is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_hash)
+            self.near_hits += 1
+            return dict(self._entries[best_hash][0]), best_distance
+
+    def add(self, image_hash: int, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.pop(image_hash, None)
+            self._entries[image_hash] = (dict(result), time.monotonic() + self.ttl_seconds)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            lookups = hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "ttl_seconds": self.ttl_seconds,
+                "exact_hits": self.exact_hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
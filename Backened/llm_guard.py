@@ -0,0 +1,223 @@
+"""
+Admission control for LLM calls: rate limit, adaptive concurrency and a circuit breaker.
+
+GuardedBackend wraps an LLM backend and admits a call only when
+    1. the circuit breaker is closed (or half-open and probing),
+    2. the token bucket has a token (sustained rate plus burst), and
+    3. fewer calls are in flight than the adaptive concurrency limit.
+Anything else raises LlmUnavailable immediately, so callers fall back to the
+pattern analysis in microseconds instead of queueing behind a failing API.
+
+The concurrency limit follows AIMD: it grows by one call per limit's worth of
+fast successes and is cut multiplicatively on errors, timeouts or latency
+above twice the target. Every admitted call runs under an explicit timeout;
+a call that overruns keeps its slot until it really returns, so a hung API
+cannot be hit with more calls than the limit.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict
+
+
+class LlmUnavailable(RuntimeError):
+    """
+    The call was not admitted or did not complete; fall back without the LLM
+    """
+
+
+class TokenBucket:
+    """
+    Non-blocking token bucket: rate tokens per second, up to burst stored
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return min(self.burst, self._tokens + (time.monotonic() - self._updated) * self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    In-flight cap that adapts to observed latency and errors (AIMD)
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 8, target_latency: float = 5.0, backoff: float = 0.7):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, latency: float, ok: bool) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            if not ok or latency > 2 * self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+            elif latency <= self.target_latency:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures; after reset_timeout one
+    probe call is let through (half-open) and its outcome closes or re-opens it
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """
+        Cheap check without side effects, for rejecting before any work is scheduled
+        """
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self._probing = False
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """
+        The admitted probe never reached the API; let the next call probe instead
+        """
+        with self._lock:
+            self._probing = False
+
+    def record(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.state = "closed"
+                self.failures = 0
+            else:
+                self.failures += 1
+                if self.state == "half_open" or self.failures >= self.failure_threshold:
+                    if self.state != "open":
+                        self.times_opened += 1
+                    self.state = "open"
+                    self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class GuardedBackend:
+    """
+    LLM backend wrapper applying the breaker, rate limit, concurrency limit and timeout
+    """
+
+    def __init__(self, backend, rate: float = 5.0, burst: int = 10, min_in_flight: int = 1,
+                 max_in_flight: int = 8, target_latency: float = 5.0, timeout: float = 10.0,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.backend = backend
+        self.name = backend.name
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AdaptiveLimiter(min_in_flight, max_in_flight, target_latency)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        # Calls run here so the caller can stop waiting at the timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="llm-call")
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "succeeded": 0, "failed": 0, "timed_out": 0,
+                       "rejected_circuit_open": 0, "rejected_rate_limited": 0, "rejected_concurrency": 0}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def available(self) -> bool:
+        """
+        False while the circuit is open; lets callers skip scheduling the call at all
+        """
+        if self.breaker.is_open():
+            self._count("rejected_circuit_open")
+            return False
+        return True
+
+    def generate(self, prompt: str) -> str:
+        if not self.breaker.allow():
+            self._count("rejected_circuit_open")
+            raise LlmUnavailable("circuit open")
+        if not self.bucket.try_acquire():
+            self._count("rejected_rate_limited")
+            self.breaker.release_probe()
+            raise LlmUnavailable("rate limited")
+        if not self.limiter.try_acquire():
+            self._count("rejected_concurrency")
+            self.breaker.release_probe()
+            raise LlmUnavailable("concurrency limit reached")
+
+        self._count("calls")
+        started = time.monotonic()
+        future = self._executor.submit(self.backend.generate, prompt)
+        future.add_done_callback(lambda done: self._finish(done, started))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._count("timed_out")
+            raise LlmUnavailable(f"timed out after {self.timeout:.1f}s")
+        except Exception as e:
+            # Quota, auth and transport errors all mean the same to callers: no LLM this time
+            raise LlmUnavailable(f"{type(e).__name__}: {e}") from e
+
+    def _finish(self, future, started: float) -> None:
+        latency = time.monotonic() - started
+        ok = future.exception() is None and latency <= self.timeout
+        self.limiter.release(latency, ok)
+        self.breaker.record(ok)
+        self._count("succeeded" if ok else "failed")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "circuit": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "tokens": round(self.bucket.tokens, 2),
+        })
+        return stats
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,115 @@
+"""
+Micro-batching scheduler for per-request model inference.
+
+Concurrent requests each need one row scored by the same model. Instead of
+one predict call per request, callers submit their input and a background
+thread collects everything that arrives within a short window (or until the
+batch is full), scores it with a single batch call and hands each caller its
+own result.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """
+    Collects submitted items into batches for batch_fn(items) -> results.
+
+    batch_fn must return one result per item, in order. The worker thread is
+    started on first submit so the batcher is safe to create before a fork.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], window_seconds: float = 0.003,
+                 max_batch_size: int = 64, name: str = "batcher"):
+        self.batch_fn = batch_fn
+        self.window_seconds = max(0.0, window_seconds)
+        self.max_batch_size = max(1, max_batch_size)
+        self.name = name
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.histogram = {bucket: 0 for bucket in BATCH_SIZE_BUCKETS}
+        self.histogram["+Inf"] = 0
+
+    def submit(self, item: Any) -> Future:
+        """
+        Queue item for the next batch and return a Future for its result
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name=f"{self.name}-worker", daemon=True)
+                self._worker.start()
+
+    def _collect(self) -> List[tuple]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # Window closed: still take whatever is already waiting
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self._record(len(batch))
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: expected {len(batch)} results, got {len(results)}")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def _record(self, size: int) -> None:
+        with self._stats_lock:
+            self.batches += 1
+            self.items += size
+            for bucket in BATCH_SIZE_BUCKETS:
+                if size <= bucket:
+                    self.histogram[bucket] += 1
+                    break
+            else:
+                self.histogram["+Inf"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "window_ms": self.window_seconds * 1000,
+                "max_batch_size": self.max_batch_size,
+                "queued": self._queue.qsize(),
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "batch_size_histogram": {str(bucket): count for bucket, count in self.histogram.items()},
+            }
@@ -0,0 +1,200 @@
+"""
+Versioned, memory-mappable on-disk format for the trained models.
+
+An artifact is a directory holding one .npy file per array plus a small
+manifest.json with the vocabulary and metadata:
+
+    model_artifact/
+        manifest.json
+        feature.npy  threshold.npy  children.npy  value.npy
+        roots.npy  is_leaf.npy  idf.npy
+
+Serving opens the arrays with np.load(mmap_mode="r"), so startup does not
+deserialize the forest and every worker process maps the same physical pages
+from the OS page cache instead of holding a private copy.
+"""
+
+import json
+import os
+import re
+import shutil
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from forest_engine import CompactForest, export_forest
+
+ARTIFACT_FORMAT = "fakenews-model-artifact"
+ARTIFACT_FORMAT_VERSION = 1
+FOREST_ARRAYS = ("feature", "threshold", "children", "value", "roots", "is_leaf")
+
+
+class SparseRows(NamedTuple):
+    """
+    Minimal CSR matrix (indptr/indices/data/shape), enough for CompactForest
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    shape: Tuple[int, int]
+
+
+class CompactTfidfVectorizer:
+    """
+    Reimplementation of TfidfVectorizer.transform for word n-gram models
+    """
+
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, params: Dict[str, Any]):
+        self.vocabulary_ = {term: index for index, term in enumerate(vocabulary)}
+        self.idf_ = idf
+        self.lowercase = params["lowercase"]
+        self.token_pattern = re.compile(params["token_pattern"])
+        self.ngram_range = tuple(params["ngram_range"])
+        self.stop_words = frozenset(params["stop_words"] or ())
+        self.norm = params["norm"]
+        self.sublinear_tf = params["sublinear_tf"]
+
+    def _analyze(self, text: str) -> List[str]:
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text) if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        grams = tokens if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def transform(self, texts: List[str]) -> SparseRows:
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        vocabulary = self.vocabulary_
+        for text in texts:
+            counts = Counter(vocabulary[term] for term in self._analyze(text) if term in vocabulary)
+            columns = sorted(counts)
+            values = np.array([counts[column] for column in columns], dtype=np.float64)
+            if self.sublinear_tf and len(values):
+                values = np.log(values) + 1
+            if self.idf_ is not None and len(values):
+                values *= self.idf_[columns]
+            if self.norm == "l2" and len(values):
+                values /= np.sqrt(np.dot(values, values))
+            elif self.norm == "l1" and len(values):
+                values /= np.abs(values).sum()
+            indices.extend(columns)
+            data.extend(values.tolist())
+            indptr.append(len(indices))
+        return SparseRows(
+            np.array(indptr, dtype=np.int64),
+            np.array(indices, dtype=np.int32),
+            np.array(data, dtype=np.float64),
+            (len(texts), len(vocabulary)),
+        )
+
+
+def _vectorizer_params(vectorizer) -> Dict[str, Any]:
+    params = vectorizer.get_params()
+    unsupported = {
+        "analyzer": params["analyzer"] != "word",
+        "tokenizer": params["tokenizer"] is not None,
+        "preprocessor": params["preprocessor"] is not None,
+        "strip_accents": params["strip_accents"] is not None,
+        "binary": params["binary"],
+    }
+    problems = [name for name, bad in unsupported.items() if bad]
+    if problems:
+        raise ValueError(f"Vectorizer settings not supported by the artifact format: {', '.join(problems)}")
+    stop_words = vectorizer.get_stop_words()
+    return {
+        "lowercase": params["lowercase"],
+        "token_pattern": params["token_pattern"],
+        "ngram_range": list(params["ngram_range"]),
+        "stop_words": sorted(stop_words) if stop_words else None,
+        "norm": params["norm"],
+        "use_idf": params["use_idf"],
+        "sublinear_tf": params["sublinear_tf"],
+    }
+
+
+def save_model_artifact(rf_model, vectorizer, path: str = "model_artifact") -> str:
+    """
+    Write the forest and vectorizer as a versioned artifact directory.
+
+    The directory is written next to the target and swapped in with a rename
+    so serving processes never see a half-written artifact.
+    """
+    params = _vectorizer_params(vectorizer)
+    forest = export_forest(rf_model)
+    vocabulary = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+
+    arrays = {name: forest[name] for name in FOREST_ARRAYS}
+    if params["use_idf"]:
+        arrays["idf"] = np.asarray(vectorizer.idf_, dtype=np.float64)
+
+    staging = path.rstrip("/\\") + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array))
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "forest": {
+            "format_version": int(forest["format_version"]),
+            "n_estimators": len(forest["roots"]),
+            "n_nodes": len(forest["feature"]),
+            "n_features": int(forest["n_features"]),
+            "max_depth": int(forest["max_depth"]),
+            "classes": forest["classes"].tolist(),
+        },
+        "vectorizer": params,
+        "arrays": {
+            name: {"file": f"{name}.npy", "dtype": str(array.dtype), "shape": list(array.shape)}
+            for name, array in arrays.items()
+        },
+        "vocabulary": vocabulary,
+    }
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    previous = path.rstrip("/\\") + ".old"
+    shutil.rmtree(previous, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, previous)
+    os.rename(staging, path)
+    shutil.rmtree(previous, ignore_errors=True)
+    return path
+
+
+def load_model_artifact(path: str = "model_artifact", mmap: bool = True) -> Tuple[CompactTfidfVectorizer, CompactForest, Dict[str, Any]]:
+    """
+    Open an artifact directory; returns (vectorizer, forest, manifest)
+    """
+    with open(os.path.join(path, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != ARTIFACT_FORMAT or manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact: {manifest.get('format')} v{manifest.get('format_version')}")
+
+    arrays = {}
+    for name, spec in manifest["arrays"].items():
+        array = np.load(os.path.join(path, spec["file"]), mmap_mode="r" if mmap else None, allow_pickle=False)
+        if str(array.dtype) != spec["dtype"] or list(array.shape) != spec["shape"]:
+            raise ValueError(f"Model artifact array {name} does not match its manifest")
+        arrays[name] = array
+
+    forest_meta = manifest["forest"]
+    forest = CompactForest({
+        **{name: arrays[name] for name in FOREST_ARRAYS},
+        "format_version": np.array(forest_meta["format_version"]),
+        "classes": np.array(forest_meta["classes"]),
+        "n_features": np.array(forest_meta["n_features"]),
+        "max_depth": np.array(forest_meta["max_depth"]),
+    })
+    vectorizer = CompactTfidfVectorizer(manifest["vocabulary"], arrays.get("idf"), manifest["vectorizer"])
+    return vectorizer, forest, manifest
@@ -4,7 +4,6 @@
 # ==========================================
 
 import pandas as pd
-import re
 import csv
 import os
 from sklearn.model_selection import train_test_split
@@ -12,14 +11,9 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report
 import pickle
-
-def clean_text(text):
-    """Clean and preprocess text for analysis"""
-    text = str(text).lower()
-    text = re.sub(r"http\S+|www\S+", " ", text)
-    text = re.sub(r"[^a-z\s]", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+import numpy as np
+from model_artifact import load_model_artifact, save_model_artifact
+from text_cleaning import clean_text
 
 def load_dataset(path="WELFake_Dataset.csv"):
     """Load and preprocess the dataset"""
@@ -91,8 +85,9 @@ def train_model(df, test_size=0.2, random_state=42):
     
     return rf, vectorizer, accuracy
 
-def save_models(rf_model, vectorizer, model_path="rf_model.pkl", vectorizer_path="tfidf_vectorizer.pkl"):
-    """Save trained models to disk"""
+def save_models(rf_model, vectorizer, model_path="rf_model.pkl", vectorizer_path="tfidf_vectorizer.pkl",
+                artifact_path="model_artifact"):
+    """Save trained models to disk (pickles plus the memory-mappable serving artifact)"""
     print("💾 Saving models...")
     
     # Create directory if it doesn't exist
@@ -106,9 +101,24 @@ def save_models(rf_model, vectorizer, model_path="rf_model.pkl", vectorizer_path
     with open(vectorizer_path, "wb") as f:
         pickle.dump(vectorizer, f)
     
+    # Save the versioned serving artifact (.npy arrays + manifest)
+    save_model_artifact(rf_model, vectorizer, artifact_path)
+    
     print(f"✅ Models saved successfully!")
     print(f"   - Model: {model_path}")
     print(f"   - Vectorizer: {vectorizer_path}")
+    print(f"   - Serving artifact: {artifact_path}/")
+
+def verify_artifact_parity(rf_model, vectorizer, artifact_path, texts, tolerance=1e-6):
+    """Check the memory-mapped artifact reproduces sklearn's predict_proba"""
+    compact_vectorizer, compact_forest, _ = load_model_artifact(artifact_path)
+    expected = rf_model.predict_proba(vectorizer.transform(texts))
+    actual = compact_forest.predict_proba(compact_vectorizer.transform(texts))
+    max_diff = float(np.abs(expected - actual).max()) if len(texts) else 0.0
+    if max_diff > tolerance:
+        raise ValueError(f"Model artifact does not match sklearn (max difference {max_diff:.2e})")
+    print(f"✅ Model artifact matches sklearn on {len(texts)} documents (max difference {max_diff:.2e})")
+    return max_diff
 
 def predict_fake_news(text, rf_model, vectorizer):
     """Predict if news is fake or real"""
@@ -145,6 +155,10 @@ def main():
         # Save models
         save_models(rf_model, vectorizer)
         
+        # Check the serving artifact against sklearn
+        parity_sample = df['cleaned'].sample(n=min(1000, len(df)), random_state=0).tolist()
+        verify_artifact_parity(rf_model, vectorizer, "model_artifact", parity_sample)
+        
         # Test prediction
         print("\n--- 🔍 Testing Prediction ---")
         sample_news = "The government announced free education for all citizens next year."
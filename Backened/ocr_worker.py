@@ -0,0 +1,124 @@
+"""
+OCR jobs executed in the process pool, plus the cheap image fingerprint
+used to skip OCR for images that were already read.
+
+This module deliberately imports nothing from app.py, so spawned pool
+workers start quickly and hold only PIL and pytesseract. Images are
+normalized before Tesseract sees them: EXIF rotation applied, transparency
+flattened onto white, converted to grayscale and downscaled so the long side
+is at most max_side (JPEGs are decoded directly at reduced scale).
+"""
+
+import base64
+import binascii
+import io
+import time
+from typing import Any, Dict, Tuple
+
+
+class OcrUnavailable(RuntimeError):
+    """
+    PIL, pytesseract or the tesseract binary is missing
+    """
+
+
+class InvalidImage(ValueError):
+    """
+    The upload is not a decodable image (or is unreasonably large)
+    """
+
+
+def normalize_image(data: bytes, max_side: int = 2000, max_pixels: int = 40_000_000) -> Tuple[Any, Tuple[int, int]]:
+    """
+    Decode and prepare an image for OCR; returns (image, original_size)
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise OcrUnavailable("PIL not installed") from e
+
+    try:
+        image = Image.open(io.BytesIO(data))
+    except (Image.UnidentifiedImageError, OSError) as e:
+        raise InvalidImage("Unsupported or corrupt image") from e
+
+    original_size = image.size
+    # Image.open only reads the header, so this check happens before decoding pixels
+    if original_size[0] * original_size[1] > max_pixels:
+        raise InvalidImage(f"Image has too many pixels ({original_size[0]}x{original_size[1]})")
+
+    try:
+        if image.format == "JPEG":
+            # Let the JPEG decoder scale down by a power of two while decoding
+            image.draft("L", (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            background = Image.new("RGBA", rgba.size, (255, 255, 255, 255))
+            image = Image.alpha_composite(background, rgba)
+        if image.mode != "L":
+            image = image.convert("L")
+        if max(image.size) > max_side:
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+    except OSError as e:
+        raise InvalidImage("Unsupported or corrupt image") from e
+    return image, original_size
+
+
+def ocr_image(data: bytes, max_side: int = 2000, max_pixels: int = 40_000_000, lang: str = "eng") -> Dict[str, Any]:
+    """
+    Run Tesseract on raw image bytes
+    """
+    try:
+        import pytesseract
+    except ImportError as e:
+        raise OcrUnavailable("pytesseract not installed") from e
+
+    started = time.perf_counter()
+    image, original_size = normalize_image(data, max_side, max_pixels)
+    prepared = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(image, lang=lang)
+    except pytesseract.TesseractNotFoundError as e:
+        raise OcrUnavailable("tesseract binary not found") from e
+    finished = time.perf_counter()
+    return {
+        "text": text.strip(),
+        "original_size": list(original_size),
+        "ocr_size": list(image.size),
+        "prepare_seconds": round(prepared - started, 4),
+        "ocr_seconds": round(finished - prepared, 4),
+    }
+
+
+def decode_base64(image_data: str) -> bytes:
+    try:
+        return base64.b64decode(image_data, validate=False)
+    except (binascii.Error, ValueError) as e:
+        raise InvalidImage("Invalid base64 image data") from e
+
+
+def fingerprint_image(data: bytes, max_pixels: int = 40_000_000) -> int:
+    """
+    Perceptual hash (dHash) of an image; cheap enough to run before deciding to OCR
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError as e:
+        raise OcrUnavailable("PIL not installed") from e
+    from image_hash import dhash
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        if image.size[0] * image.size[1] > max_pixels:
+            raise InvalidImage(f"Image has too many pixels ({image.size[0]}x{image.size[1]})")
+        if image.format == "JPEG":
+            # Only 17x16 pixels are needed; decode at 1/8 scale
+            image.draft("L", (128, 128))
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.alpha_composite(Image.new("RGBA", rgba.size, (255, 255, 255, 255)), rgba)
+        return dhash(image)
+    except (Image.UnidentifiedImageError, OSError) as e:
+        raise InvalidImage("Unsupported or corrupt image") from e
@@ -0,0 +1,277 @@
+"""
+Pre-forking production server: load models once, fork N uvicorn workers.
+
+The parent imports the app and loads every model before forking, so workers
+share the vectorizer, forest and spaCy pipeline pages copy-on-write instead
+of each loading its own copy. The parent owns the listening socket, reports
+per-worker readiness, respawns workers that die and supports graceful
+rolling restarts.
+
+Signals handled by the parent (POSIX only):
+    SIGHUP           reload models, then replace workers one at a time
+    SIGTERM, SIGINT  graceful shutdown of all workers
+"""
+
+import gc
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+import uvicorn
+
+
+class _ReadyNotifyingServer(uvicorn.Server):
+    """
+    uvicorn server that tells the parent once startup (and model checks) finished
+    """
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if not self.should_exit and self.ready_fd is not None:
+            os.write(self.ready_fd, b"R")
+            os.close(self.ready_fd)
+            self.ready_fd = None
+
+
+class Worker:
+    def __init__(self, worker_id: int, pid: int, ready_fd: int):
+        self.worker_id = worker_id
+        self.pid = pid
+        self.ready_fd = ready_fd
+        self.ready = False
+        self.retiring = False
+        self.respawn = True
+        self.started_at = time.monotonic()
+
+
+class PreforkServer:
+    """
+    Supervisor for a fixed number of forked uvicorn workers sharing one socket
+    """
+
+    def __init__(self, app, host: str = "0.0.0.0", port: int = 8000, workers: int = 2,
+                 preload: Optional[Callable[[], None]] = None, graceful_timeout: float = 30,
+                 ready_timeout: float = 120, log_level: str = "info", backlog: int = 2048):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("Production mode needs os.fork (Linux/macOS); use a single worker on this platform")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.num_workers = max(1, workers)
+        self.preload = preload
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.log_level = log_level
+        self.backlog = backlog
+        self.workers: Dict[int, Worker] = {}
+        self.socket: Optional[socket.socket] = None
+        self._pending_signals = []
+        self._wakeup_r, self._wakeup_w = None, None
+        self._stopping = False
+
+    # Parent process
+
+    def run(self) -> None:
+        self._load_models()
+        self.socket = self._bind()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_w, False)
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._on_signal)
+
+        print(f"🚀 Prefork server on http://{self.host}:{self.port} with {self.num_workers} workers (parent pid {os.getpid()})")
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+
+        try:
+            while not self._stopping:
+                self._poll(timeout=1.0)
+                self._reap()
+                self._handle_signals()
+        finally:
+            self._shutdown()
+
+    def _load_models(self) -> None:
+        if self.preload is not None:
+            started = time.perf_counter()
+            self.preload()
+            print(f"✅ Models preloaded in parent in {time.perf_counter() - started:.2f}s")
+        # Move everything allocated so far out of the GC's reach so collections
+        # in the workers do not touch (and so copy) the shared pages
+        gc.collect()
+        gc.freeze()
+
+    def _bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+
+    def _on_signal(self, signum, _frame) -> None:
+        self._pending_signals.append(signum)
+        try:
+            os.write(self._wakeup_w, b"S")
+        except BlockingIOError:
+            pass
+
+    def _spawn(self, worker_id: int) -> Worker:
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            self._run_worker(worker_id, ready_w)
+        os.close(ready_w)
+        worker = Worker(worker_id, pid, ready_r)
+        self.workers[pid] = worker
+        print(f"👷 Worker {worker_id} started (pid {pid})")
+        return worker
+
+    def _poll(self, timeout: float) -> None:
+        waiting = {worker.ready_fd: worker for worker in self.workers.values() if worker.ready_fd is not None}
+        readable, _, _ = select.select(list(waiting) + [self._wakeup_r], [], [], timeout)
+        for fd in readable:
+            if fd == self._wakeup_r:
+                os.read(self._wakeup_r, 1024)
+                continue
+            worker = waiting[fd]
+            # Empty read means the worker exited before reporting ready
+            if os.read(fd, 1):
+                worker.ready = True
+                print(f"✅ Worker {worker.worker_id} ready (pid {worker.pid}, "
+                      f"{time.monotonic() - worker.started_at:.2f}s)")
+            os.close(fd)
+            worker.ready_fd = None
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            worker = self.workers.pop(pid, None)
+            if worker is None:
+                continue
+            if worker.ready_fd is not None:
+                os.close(worker.ready_fd)
+            if worker.retiring or not worker.respawn or self._stopping:
+                print(f"👋 Worker {worker.worker_id} (pid {pid}) exited")
+                continue
+            print(f"⚠️ Worker {worker.worker_id} (pid {pid}) died with status {os.waitstatus_to_exitcode(status)}; respawning")
+            # Back off when a worker crashes straight after starting
+            if time.monotonic() - worker.started_at < 1.0:
+                time.sleep(1.0)
+            self._spawn(worker.worker_id)
+
+    def _handle_signals(self) -> None:
+        while self._pending_signals:
+            signum = self._pending_signals.pop(0)
+            if signum == signal.SIGHUP:
+                self._rolling_restart()
+            else:
+                print(f"🛑 Received {signal.Signals(signum).name}; shutting down gracefully")
+                self._stopping = True
+
+    def _shutdown_pending(self) -> bool:
+        """
+        A SIGTERM/SIGINT is queued; checked while a rolling restart waits on workers
+        """
+        return any(signum != signal.SIGHUP for signum in self._pending_signals)
+
+    def _rolling_restart(self) -> None:
+        """
+        Reload models in the parent, then swap workers one by one so capacity never drops
+        """
+        print("🔄 Rolling restart: reloading models")
+        gc.unfreeze()
+        self._load_models()
+        for old in list(self.workers.values()):
+            if old.retiring:
+                continue
+            if self._shutdown_pending():
+                break
+            new = self._spawn(old.worker_id)
+            # Not respawned if it dies during startup; the old worker keeps serving instead
+            new.respawn = False
+            deadline = time.monotonic() + self.ready_timeout
+            while (new.pid in self.workers and not new.ready and time.monotonic() < deadline
+                   and not self._shutdown_pending()):
+                self._poll(timeout=0.5)
+                self._reap()
+            if self._shutdown_pending():
+                # The shutdown that follows stops the half-started replacement with the rest
+                break
+            if not new.ready:
+                print(f"❌ Replacement for worker {old.worker_id} did not become ready; keeping the old one")
+                if new.pid in self.workers:
+                    new.retiring = True
+                    os.kill(new.pid, signal.SIGTERM)
+                continue
+            new.respawn = True
+            old.retiring = True
+            os.kill(old.pid, signal.SIGTERM)
+        else:
+            print("✅ Rolling restart complete")
+            return
+        print("🛑 Shutdown requested; rolling restart abandoned")
+
+    def _shutdown(self) -> None:
+        self._stopping = True
+        for worker in self.workers.values():
+            try:
+                os.kill(worker.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        for worker in list(self.workers.values()):
+            print(f"⚠️ Worker {worker.worker_id} (pid {worker.pid}) did not stop in time; killing")
+            try:
+                os.kill(worker.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        if self.socket is not None:
+            self.socket.close()
+        print("👋 Prefork server stopped")
+
+    # Worker process
+
+    def _run_worker(self, worker_id: int, ready_fd: int) -> None:
+        exit_code = 0
+        try:
+            for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, signal.SIG_DFL)
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            for other in self.workers.values():
+                if other.ready_fd is not None:
+                    os.close(other.ready_fd)
+            os.environ["WORKER_ID"] = str(worker_id)
+
+            config = uvicorn.Config(
+                self.app,
+                log_level=self.log_level,
+                timeout_graceful_shutdown=self.graceful_timeout,
+            )
+            _ReadyNotifyingServer(config, ready_fd).run(sockets=[self.socket])
+        except BaseException as e:
+            print(f"❌ Worker {worker_id} failed: {e}", file=sys.stderr)
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(exit_code)
@@ -0,0 +1,322 @@
+"""
+Per-request stage timings (Server-Timing) and sampled live profiling.
+
+RequestTimingMiddleware gives every HTTP request a RequestTimings object in a
+context variable. Analysis stages add their durations to it, and the
+middleware sends them as a Server-Timing header when the response starts.
+Context variables follow the request into its asyncio tasks and into the
+thread pools (executors.py copies the context), so no state is passed around
+explicitly.
+
+While an admin has switched the ProfileSampler on, a fraction of the analyze
+requests are profiled under cProfile: the event loop for as long as the
+request runs (one sampled request at a time, so concurrent requests' loop
+work is included), and every thread-pool call the request makes, in the
+thread that runs it. The ML micro-batcher and the OCR process pool are not
+covered. The profiles are merged into one pstats table that can be
+downloaded while traffic keeps flowing. tracemalloc can be switched on with it. It traces every allocation
+in the process, so it costs more and is opt-in.
+"""
+
+import contextvars
+import cProfile
+import io
+import marshal
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class RequestTimings:
+    """
+    Stage durations of one request, aggregated by stage name
+    """
+
+    def __init__(self, include_in_body: bool = False, profiled: bool = False):
+        self.started = time.perf_counter()
+        self.include_in_body = include_in_body
+        self.profiled = profiled
+        self.stages: Dict[str, List[float]] = {}  # name -> [total seconds, count]
+
+    def add(self, name: str, seconds: float) -> None:
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        Milliseconds per stage (with a count when a stage ran more than once) plus the total so far
+        """
+        timings = {}
+        for name, (seconds, count) in self.stages.items():
+            timings[name] = {"ms": round(seconds * 1000, 2), "count": count} if count > 1 else round(seconds * 1000, 2)
+        timings["total"] = round(self.elapsed() * 1000, 2)
+        return timings
+
+    def header(self) -> str:
+        """
+        Server-Timing header value, e.g. 'llm;dur=812.4, ml;dur=4.1, total;dur=830.2'
+        """
+        parts = []
+        for name, (seconds, count) in self.stages.items():
+            part = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                part += f';desc="{count} calls"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """
+    Add a stage duration to the current request's timings; a no-op outside a request
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+class ProfileSampler:
+    """
+    Admin-controlled sampling profiler aggregating cProfile (and optionally
+    tracemalloc) data across the requests it picks
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.active = False
+        self.sample_rate = 0.0
+        self.expires_at = 0.0
+        self.started_at = None
+        self.started_tracemalloc = False
+        self._stats: Optional[pstats.Stats] = None
+        self._last_memory = None
+        self._loop_busy = False
+        self._counts = {"sampled_requests": 0, "profiled_calls": 0, "skipped_busy": 0}
+
+    def start(self, sample_rate: float, duration_seconds: float, trace_memory: bool = False,
+              memory_frames: int = 1) -> Dict[str, Any]:
+        """
+        Start (or restart) sampling; earlier profile data is discarded
+        """
+        with self._lock:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+            self.expires_at = time.monotonic() + duration_seconds
+            self.started_at = time.time()
+            self.active = True
+            self._stats = None
+            self._last_memory = None
+            self._counts = dict.fromkeys(self._counts, 0)
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(memory_frames)
+            self.started_tracemalloc = True
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop sampling; collected profiles stay available for download
+        """
+        with self._lock:
+            self.active = False
+        if self.started_tracemalloc:
+            # The report stays readable after tracing stops, until the next start
+            self._last_memory = self._memory_snapshot()
+            tracemalloc.stop()
+            self.started_tracemalloc = False
+        return self.status()
+
+    def should_sample(self) -> bool:
+        if not self.active:
+            return False
+        if time.monotonic() > self.expires_at:
+            with self._lock:
+                expired, self.active = self.active, False
+            if expired:
+                # The final tracemalloc snapshot can take a while; keep it off the event loop
+                threading.Thread(target=self.stop, name="profiler-stop", daemon=True).start()
+            return False
+        return random.random() < self.sample_rate
+
+    # Profiling
+
+    def _merge(self, profile: cProfile.Profile) -> None:
+        with self._lock:
+            if self._stats is None:
+                self._stats = pstats.Stats(profile)
+            else:
+                self._stats.add(profile)
+            self._counts["profiled_calls"] += 1
+
+    def begin_request(self) -> Optional[cProfile.Profile]:
+        """
+        Profile the event-loop side of a sampled request. Only one request at a
+        time can own the loop thread's profiler; others are still profiled in the pools.
+        """
+        with self._lock:
+            self._counts["sampled_requests"] += 1
+            if self._loop_busy:
+                self._counts["skipped_busy"] += 1
+                return None
+            self._loop_busy = True
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except (RuntimeError, ValueError):
+            # Another profiler (e.g. a debugger) owns the hook
+            with self._lock:
+                self._loop_busy = False
+                self._counts["skipped_busy"] += 1
+            return None
+        return profile
+
+    def end_request(self, profile: Optional[cProfile.Profile]) -> None:
+        if profile is None:
+            return
+        profile.disable()
+        with self._lock:
+            self._loop_busy = False
+        self._merge(profile)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run func in the current (pool) thread, under cProfile when the request is sampled
+        """
+        timings = _current.get()
+        if timings is None or not timings.profiled or not self.active or getattr(self._local, "busy", False):
+            return func(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except (RuntimeError, ValueError):
+            return func(*args, **kwargs)
+        self._local.busy = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.disable()
+            self._local.busy = False
+            self._merge(profile)
+
+    # Reports
+
+    def cpu_profile(self) -> Optional[bytes]:
+        """
+        Merged profile in the pstats file format (pstats.Stats, snakeviz, ...)
+        """
+        with self._lock:
+            return marshal.dumps(self._stats.stats) if self._stats is not None else None
+
+    def cpu_report(self, sort: str = "cumulative", limit: int = 50) -> str:
+        with self._lock:
+            if self._stats is None:
+                return "No profiled requests yet\n"
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats(sort).print_stats(limit)
+            return stream.getvalue()
+
+    def _memory_snapshot(self) -> Optional[Tuple[tracemalloc.Snapshot, Tuple[int, int]]]:
+        if not tracemalloc.is_tracing():
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            # The profiler's own merged tables
+            tracemalloc.Filter(False, pstats.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        return snapshot, tracemalloc.get_traced_memory()
+
+    def memory_report(self, key_type: str = "lineno", limit: int = 30) -> str:
+        """
+        Largest live allocations since tracing started, grouped by line (or traceback/filename)
+        """
+        taken = self._memory_snapshot() or self._last_memory
+        if taken is None:
+            return "tracemalloc is not running; start profiling with trace_memory=true\n"
+        snapshot, (current, peak) = taken
+        lines = [f"Traced memory: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB", ""]
+        for stat in snapshot.statistics(key_type)[:limit]:
+            lines.append(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {stat.traceback}")
+            if key_type == "traceback":
+                lines.extend(f"        {line}" for line in stat.traceback.format(most_recent_first=True))
+        return "\n".join(lines) + "\n"
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self.active,
+                "sample_rate": self.sample_rate,
+                "seconds_left": max(0.0, round(self.expires_at - time.monotonic(), 1)) if self.active else 0.0,
+                "started_at": self.started_at,
+                "tracemalloc": tracemalloc.is_tracing(),
+                "profile_available": self._stats is not None,
+                **self._counts,
+            }
+
+
+profiler = ProfileSampler()
+
+
+def run_profiled(func: Callable, *args, **kwargs) -> Any:
+    """
+    Pool-side entry point: func under the sampler when the calling request is sampled
+    """
+    return profiler.call(func, *args, **kwargs)
+
+
+class RequestTimingMiddleware:
+    """
+    ASGI middleware that collects stage timings per request, sends them as a
+    Server-Timing header, and profiles the request when the sampler picks it
+    """
+
+    def __init__(self, app, enabled: bool = True, body_timings: bool = False,
+                 profile_prefixes: Tuple[str, ...] = ("/analyze",)):
+        self.app = app
+        self.enabled = enabled
+        self.body_timings = body_timings
+        self.profile_prefixes = profile_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        include_in_body = self.body_timings or any(
+            name == b"x-debug-timings" and value.strip() not in (b"", b"0", b"false")
+            for name, value in scope.get("headers", [])
+        )
+        sampled = scope["path"].startswith(self.profile_prefixes) and profiler.should_sample()
+        timings = RequestTimings(include_in_body, sampled)
+        token = _current.set(timings)
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start" and self.enabled:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", timings.header().encode("latin-1")))
+                # Lets browser clients on other origins read the timings
+                headers.append((b"timing-allow-origin", b"*"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile = profiler.begin_request() if sampled else None
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            profiler.end_request(profile)
+            _current.reset(token)
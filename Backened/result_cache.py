@@ -0,0 +1,122 @@
+"""
+In-process LRU + TTL cache for analysis results.
+
+Entries are keyed by a hash of the normalized content and stored as JSON
+bytes, so size limits are exact and every hit hands out a fresh copy that the
+caller is free to modify.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """
+    Collapse whitespace so trivially re-formatted forwards share a key
+    """
+    return " ".join((text or "").split())
+
+
+def make_cache_key(text: str, title: Optional[str], source_type: str, version: str) -> str:
+    """
+    Content-addressed key over normalized text, title, source type and version
+    """
+    digest = hashlib.sha256()
+    for part in (version, source_type, normalize_text(title), normalize_text(text)):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def json_default(value: Any) -> Any:
+    # numpy scalars (e.g. from evidence gathering) expose .item()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache bounded by entry count, total bytes and entry age
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(payload)
+
+    def set(self, key: str, value: Dict[str, Any]) -> bool:
+        """
+        Store value; returns False if it is larger than the whole cache
+        """
+        return self.set_payload(key, json.dumps(value, default=json_default).encode("utf-8"))
+
+    def set_payload(self, key: str, payload: bytes) -> bool:
+        """
+        Store an already serialized value (JSON bytes), e.g. one shared with the persistent store
+        """
+        if len(payload) > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, time.monotonic() + self.ttl_seconds)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def _remove(self, key: str) -> None:
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -3,6 +3,8 @@
 Fake News Detection API Server Startup Script
 """
 
+import argparse
+import importlib.util
 import os
 import sys
 import subprocess
@@ -11,25 +13,20 @@ from pathlib import Path
 from dotenv import load_dotenv
 
 def check_requirements():
-    """Check if all required packages are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        import pandas
-        import sklearn
-        import nltk
-        import spacy
-        import google.generativeai as genai
-        import transformers
-        import torch
-        import PIL
-        import pytesseract
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing required package: {e}")
-        print("Please install requirements: pip install -r requirements.txt")
-        return False
+    """Check if all required packages are installed (located, not imported, to keep startup fast)"""
+    packages = ["fastapi", "uvicorn", "pandas", "sklearn", "nltk", "spacy", "google.generativeai",
+                "transformers", "torch", "PIL", "pytesseract"]
+    for package in packages:
+        try:
+            found = importlib.util.find_spec(package) is not None
+        except ImportError:
+            found = False
+        if not found:
+            print(f"❌ Missing required package: {package}")
+            print("Please install requirements: pip install -r requirements.txt")
+            return False
+    print("✅ All required packages are installed")
+    return True
 
 def check_models():
     """Check if trained models exist"""
@@ -51,20 +48,46 @@ def check_models():
 
 def check_spacy_model():
     """Check if spaCy English model is installed"""
-    try:
-        import spacy
-        nlp = spacy.load("en_core_web_sm")
+    import config
+    if config.LINGUISTIC_MODE == "minimal":
+        return True
+    if importlib.util.find_spec(config.SPACY_MODEL) is not None:
         print("✅ spaCy English model found")
         return True
-    except OSError:
-        print("⚠️  spaCy English model not found. Installing...")
-        try:
-            subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"], check=True)
-            print("✅ spaCy English model installed")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install spaCy model. Some features may not work.")
-            return False
+    print("⚠️  spaCy English model not found. Installing...")
+    try:
+        subprocess.run([sys.executable, "-m", "spacy", "download", config.SPACY_MODEL], check=True)
+        print("✅ spaCy English model installed")
+        return True
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install spaCy model. Some features may not work.")
+        return False
+
+def check_nltk_data():
+    """Bundle NLTK data into NLTK_DATA_DIR once unless NLTK already finds it; the server never downloads it at runtime"""
+    import config
+    try:
+        import nltk
+    except ImportError:
+        print("⚠️  NLTK is not installed. Sentiment analysis will be disabled.")
+        return False
+    data_dir = os.path.abspath(config.NLTK_DATA_DIR)
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+        print("✅ NLTK data found")
+        return True
+    except LookupError:
+        pass
+    print(f"⚠️  NLTK data not found. Downloading to {config.NLTK_DATA_DIR}...")
+    try:
+        subprocess.run([sys.executable, "-m", "nltk.downloader", "-d", config.NLTK_DATA_DIR, "vader_lexicon"], check=True)
+        print("✅ NLTK data downloaded")
+        return True
+    except subprocess.CalledProcessError:
+        print("❌ Failed to download NLTK data. Sentiment analysis will be disabled.")
+        return False
 
 def setup_environment():
     """Setup environment variables"""
@@ -86,8 +109,30 @@ def setup_environment():
             f.write("DATABASE_URL=sqlite:///./fakenews.db\n")
         print("✅ Created .env file template")
 
+def run_production(host, port, workers):
+    """Serve with pre-forked workers that share models loaded once in this process"""
+    import config
+    from app import app, warm_up_models
+    from prefork import PreforkServer
+
+    PreforkServer(
+        app,
+        host=host,
+        port=port,
+        workers=workers,
+        preload=warm_up_models,
+        graceful_timeout=config.GRACEFUL_TIMEOUT,
+    ).run()
+
 def main():
     """Main startup function"""
+    parser = argparse.ArgumentParser(description="Fake News Detection API Server")
+    parser.add_argument("--production", action="store_true", help="pre-forked workers, no auto-reload")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes in production mode (default: WEB_WORKERS)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
     print("🚀 Starting Fake News Detection API Server")
     print("=" * 50)
     
@@ -101,26 +146,33 @@ def main():
     # Check spaCy model
     check_spacy_model()
     
+    # Check NLTK data
+    check_nltk_data()
+    
     # Check models
     if not check_models():
         print("❌ Failed to prepare models. Exiting.")
         sys.exit(1)
     
     print("\n🌐 Starting API server...")
-    print("API will be available at: http://localhost:8000")
-    print("API documentation: http://localhost:8000/docs")
+    print(f"API will be available at: http://localhost:{args.port}")
+    print(f"API documentation: http://localhost:{args.port}/docs")
     print("Press Ctrl+C to stop the server")
     print("-" * 50)
     
     # Start the server
     try:
-        uvicorn.run(
-            "app:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            log_level="info"
-        )
+        if args.production:
+            import config
+            run_production(args.host, args.port, args.workers or config.WEB_WORKERS)
+        else:
+            uvicorn.run(
+                "app:app",
+                host=args.host,
+                port=args.port,
+                reload=True,
+                log_level="info"
+            )
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
     except Exception as e:
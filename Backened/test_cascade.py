@@ -0,0 +1,39 @@
+"""
+Tests for the cascade policy's decisive shortcuts
+"""
+
+from cascade import CascadePolicy
+
+
+def pattern_result(verdict, confidence, indicators):
+    """
+    analyze_with_patterns-shaped result with one hit per (indicator, categories) pair
+    """
+    hits = []
+    for position, (indicator, categories) in enumerate(indicators):
+        hits.append({"indicator": indicator, "categories": categories, "start": position * 20, "end": position * 20 + len(indicator)})
+    return {"verdict": verdict, "confidence": confidence, "indicator_hits": hits}
+
+
+def test_repeated_gov_scam_indicator_counts_once():
+    # "according to", "university" and "WhatsApp" twice: analyze_with_patterns says REAL 0.85
+    patterns = pattern_result("REAL", 0.85, [
+        ("according to", ["real"]),
+        ("university", ["real"]),
+        ("whatsapp", ["fake", "gov_scam"]),
+        ("whatsapp", ["fake", "gov_scam"]),
+    ])
+    decision = CascadePolicy().decide(patterns, None)
+    assert "government scam" not in decision["reason"]
+    assert decision["verdict"] == "REAL"
+
+
+def test_distinct_gov_scam_indicators_are_decisive():
+    patterns = pattern_result("FAKE", 0.95, [
+        ("whatsapp", ["fake", "gov_scam"]),
+        ("register your name", ["fake", "gov_scam"]),
+    ])
+    decision = CascadePolicy().decide(patterns, None)
+    assert not decision["escalated"]
+    assert decision["verdict"] == "FAKE"
+    assert decision["reason"] == "2 government scam indicators"
@@ -0,0 +1,53 @@
+"""
+Tests for the indicator matcher's hit positions, and for the api/ copy staying in sync
+"""
+
+import os
+
+from indicator_matcher import IndicatorMatcher
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MATCHER = IndicatorMatcher({
+    "fake": ["shocking", "click here", "secret"],
+    "real": ["according to", "university"],
+})
+
+
+def test_api_copy_is_identical():
+    with open(os.path.join(BACKEND_DIR, "indicator_matcher.py"), "rb") as f:
+        backend = f.read()
+    with open(os.path.join(BACKEND_DIR, "..", "api", "indicator_matcher.py"), "rb") as f:
+        api = f.read()
+    assert backend == api, "api/indicator_matcher.py differs from Backened/indicator_matcher.py; copy it over"
+
+
+def test_offsets_point_into_the_original_text():
+    text = "SHOCKING news, according to the University. Click HERE!"
+    hits = MATCHER.find_all(text)
+    assert [hit.indicator for hit in hits] == ["shocking", "according to", "university", "click here"]
+    for hit in hits:
+        assert hit.field == "text"
+        assert text[hit.start:hit.end].lower() == hit.indicator
+
+
+def test_offsets_survive_characters_that_lowercase_longer():
+    # "İ".lower() is two characters, which used to shift every later offset
+    text = "İİ İstanbul: SHOCKING secret"
+    assert len(text.lower()) > len(text)
+    hits = MATCHER.find_all(text)
+    assert [text[hit.start:hit.end] for hit in hits] == ["SHOCKING", "secret"]
+
+
+def test_title_hits_are_tagged_and_relative_to_the_title():
+    hits = MATCHER.find_all("A report according to officials.", "Shocking secret")
+    assert [(hit.indicator, hit.field, hit.start, hit.end) for hit in hits] == [
+        ("according to", "text", 9, 21),
+        ("shocking", "title", 0, 8),
+        ("secret", "title", 9, 15),
+    ]
+
+
+def test_word_boundaries():
+    assert MATCHER.find_all("The secretary spoke") == []
+    assert [hit.indicator for hit in MATCHER.find_all("a secret, kept")] == ["secret"]
@@ -0,0 +1,53 @@
+"""
+Tests for long-document analysis and the result cache
+"""
+
+import asyncio
+import os
+import tempfile
+
+# Offline settings, read when app is imported
+os.environ.setdefault("LLM_BACKEND", "stub")
+os.environ.setdefault("LLM_STUB_LATENCY_MS", "0")
+os.environ.setdefault("LINGUISTIC_MODE", "minimal")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='test_long_document_'), 'test.db')}")
+
+import app  # noqa: E402
+import config  # noqa: E402
+
+SENTENCES = [
+    "According to officials, the ministry published its annual report on Tuesday.",
+    "The study was published in a peer-reviewed journal by researchers at the university.",
+    "Data from the statistics office showed inflation eased to 4.2% last quarter.",
+]
+
+
+def long_text():
+    parts, n = [], 0
+    while sum(len(part) + 1 for part in parts) < config.MAX_TEXT_LENGTH * 2:
+        parts.append(f"{SENTENCES[n % len(SENTENCES)]} ({n})")
+        n += 1
+    return " ".join(parts)
+
+
+def test_long_document_excerpt_is_not_cached_as_short_text(monkeypatch):
+    app.initialize_llm_client()
+    app.result_cache.clear()
+    excerpts = []
+    original = app.comprehensive_analysis
+
+    async def recording_analysis(text, *args, **kwargs):
+        excerpts.append(text)
+        return await original(text, *args, **kwargs)
+
+    async def run():
+        monkeypatch.setattr(app, "comprehensive_analysis", recording_analysis)
+        document = await app.analyze_long_document(long_text(), "Annual report", "text")
+        monkeypatch.setattr(app, "comprehensive_analysis", original)
+        # The excerpt analyzed for the long document, sent again as ordinary text
+        return document, await app.comprehensive_analysis(excerpts[0], "Annual report", "text")
+
+    document, short = asyncio.run(run())
+    assert "long_document" in document.analysis
+    assert short.analysis["cache"] == "miss"
+    assert "long_document" not in short.analysis
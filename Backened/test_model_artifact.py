@@ -0,0 +1,70 @@
+"""
+Tests for the memory-mapped model artifact (CompactTfidfVectorizer + CompactForest)
+against the sklearn models it replaces on the serving path
+"""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from model_artifact import load_model_artifact, save_model_artifact
+from text_cleaning import clean_text
+
+TRAINING = [
+    ("shocking secret the government is hiding from you share before it is deleted", 1),
+    ("doctors hate this one miracle trick that cures everything overnight", 1),
+    ("register your name on the whatsapp link to claim a free laptop from the ministry", 1),
+    ("breaking breaking you will not believe what happened next click now click now", 1),
+    ("the ministry published its annual report on tuesday according to officials", 0),
+    ("researchers at the university published the study in a peer reviewed journal", 0),
+    ("data from the statistics office showed inflation eased last quarter", 0),
+    ("the central bank kept interest rates unchanged at its monthly meeting", 0),
+]
+
+QUERIES = [
+    "Officials say the university study on inflation was published on Tuesday.",
+    "SHOCKING trick the government hides: share before it is deleted!!!",
+    "Register on WhatsApp for a free laptop from the ministry",
+    # Repeated terms, where sublinear_tf and the norm matter
+    "Share share share this now, the government government is hiding the report report.",
+    # No word from the vocabulary: an all-zero row
+    "zzz qqq xyzzy",
+    "",
+]
+
+
+@pytest.mark.parametrize("vectorizer_params", [
+    {"max_features": 10000, "stop_words": "english"},  # as modeltrain.py trains it
+    {"ngram_range": (1, 2), "sublinear_tf": True},
+])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_artifact_matches_sklearn(tmp_path, vectorizer_params, mmap):
+    texts = [clean_text(text) for text, _ in TRAINING]
+    labels = [label for _, label in TRAINING]
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    rf_model = RandomForestClassifier(n_estimators=15, random_state=0).fit(vectorizer.fit_transform(texts), labels)
+
+    path = save_model_artifact(rf_model, vectorizer, str(tmp_path / "model_artifact"))
+    compact_vectorizer, compact_forest, manifest = load_model_artifact(path, mmap=mmap)
+    assert manifest["forest"]["n_estimators"] == 15
+
+    queries = [clean_text(text) for text in QUERIES] + texts
+    # TF-IDF features first: the forest's thresholds can hide small differences
+    compact_rows = compact_vectorizer.transform(queries)
+    dense = np.zeros(compact_rows.shape)
+    for row in range(len(queries)):
+        lo, hi = compact_rows.indptr[row], compact_rows.indptr[row + 1]
+        dense[row, compact_rows.indices[lo:hi]] = compact_rows.data[lo:hi]
+    np.testing.assert_allclose(dense, vectorizer.transform(queries).toarray(), rtol=0, atol=1e-12)
+
+    expected = rf_model.predict_proba(vectorizer.transform(queries))
+    # Batched
+    actual = compact_forest.predict_proba(compact_vectorizer.transform(queries))
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+    # One row at a time, as single /analyze/text requests score
+    for query, row in zip(queries, expected):
+        single = compact_forest.predict_proba(compact_vectorizer.transform([query]))
+        np.testing.assert_allclose(single[0], row, rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(compact_forest.predict(compact_vectorizer.transform(queries)),
+                                  rf_model.predict(vectorizer.transform(queries)))
@@ -0,0 +1,21 @@
+"""
+Text cleaning shared by training (modeltrain.py) and serving (app.py).
+
+The TF-IDF vocabulary is built from cleaned text, so both sides must clean
+identically; keeping the one implementation here stops them drifting apart.
+"""
+
+import re
+
+URL_PATTERN = re.compile(r"http\S+|www\S+")
+NON_ALPHA_PATTERN = re.compile(r"[^a-z\s]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def clean_text(text):
+    """Clean and preprocess text for analysis"""
+    text = str(text).lower()
+    text = URL_PATTERN.sub(" ", text)
+    text = NON_ALPHA_PATTERN.sub(" ", text)
+    text = WHITESPACE_PATTERN.sub(" ", text).strip()
+    return text
@@ -0,0 +1,362 @@
+"""
+Shared URL fetcher: pooled connections, streaming size cap and an on-disk HTTP cache.
+
+One UrlFetcher (and so one requests.Session with keep-alive connection pools)
+serves every /analyze/url request. Bodies are streamed and abandoned as soon
+as they exceed max_bytes, and non-text content types are rejected from the
+response headers before any of the body is read. Responses with an ETag,
+Last-Modified or Cache-Control max-age are stored on disk, so repeat URLs are
+served fresh from disk or revalidated with a conditional GET (304).
+
+fetch() blocks; from async code run it on the I/O pool (executors.run_io).
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+DEFAULT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+CHUNK_SIZE = 64 * 1024
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+
+class FetchError(Exception):
+    """
+    The URL could not be fetched or its content is not acceptable
+    """
+
+
+class ContentTooLarge(FetchError):
+    pass
+
+
+class UnsupportedContentType(FetchError):
+    pass
+
+
+class FetchedPage(NamedTuple):
+    url: str
+    text: str
+    content_type: str
+    encoding: str
+    cache_status: str  # "miss", "fresh" (served from disk) or "revalidated" (304)
+    bytes_downloaded: int
+
+
+def parse_cache_control(header: Optional[str]) -> Dict[str, Optional[str]]:
+    directives = {}
+    for part in (header or "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def detect_encoding(body: bytes, content_type_header: str) -> str:
+    """
+    Charset from the Content-Type header, else a <meta charset>, else UTF-8
+    """
+    # An explicit charset only; requests' ISO-8859-1 default for text/* is usually wrong
+    for param in content_type_header.split(";")[1:]:
+        name, _, value = param.strip().partition("=")
+        if name.lower() == "charset" and value:
+            return value.strip("\"'")
+    match = _META_CHARSET.search(body[:4096])
+    if match:
+        return match.group(1).decode("ascii")
+    return "utf-8"
+
+
+class HttpCache:
+    """
+    Size-bounded on-disk cache of response bodies plus their validators.
+
+    Each entry is two files named by the URL hash: <key>.body and <key>.json.
+    Files are written to a temp name and renamed, so concurrent workers
+    sharing the directory never read partial entries. Least recently used
+    entries are evicted once the directory exceeds max_bytes.
+
+    Puts keep a running total of the body bytes instead of scanning the
+    directory each time; it is seeded by one scan on the first put. Other
+    workers' writes and evictions are not seen, so the total is corrected by
+    a full scan every rescan_every puts and whenever it crosses max_bytes.
+    Eviction then goes down to 90% of max_bytes, so the next scan is not due
+    straight away.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, rescan_every: int = 500):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_every = rescan_every
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # unknown until the first scan
+        self._puts_since_scan = 0
+        self.scans = 0
+
+    def _paths(self, url: str) -> Tuple[str, str]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key)
+        return base + ".json", base + ".body"
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+        # Access time drives LRU eviction; another worker may have evicted the entry since the read
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return meta, body
+
+    def put(self, url: str, meta: Dict[str, Any], body: Optional[bytes] = None) -> None:
+        """
+        Store an entry; with body=None only the metadata is refreshed (after a 304)
+        """
+        meta_path, body_path = self._paths(url)
+        os.makedirs(self.directory, exist_ok=True)
+        meta = dict(meta, url=url)
+        if body is not None:
+            try:
+                replaced = os.stat(body_path).st_size
+            except OSError:
+                replaced = 0
+            meta["size"] = len(body)
+            self._write_atomic(body_path, body)
+        self._write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        if body is not None:
+            self._account(len(body) - replaced)
+
+    def _account(self, delta: int) -> None:
+        with self._lock:
+            self._puts_since_scan += 1
+            if self._total_bytes is not None:
+                self._total_bytes += delta
+            if (self._total_bytes is None or self._total_bytes > self.max_bytes
+                    or self._puts_since_scan >= self.rescan_every):
+                self._evict()
+
+    def _write_atomic(self, path: str, data: bytes) -> None:
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _evict(self) -> None:
+        """
+        Rescan the directory, recount the total and evict down to 90% once it is over max_bytes
+        (caller holds the lock)
+        """
+        self.scans += 1
+        self._puts_since_scan = 0
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total > self.max_bytes:
+            target = self.max_bytes * 0.9
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                for victim in (path, path[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(victim)
+                    except OSError:
+                        pass
+                total -= size
+        self._total_bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            self._total_bytes = None
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class UrlFetcher:
+    """
+    Thread-safe page fetcher shared by all requests
+    """
+
+    def __init__(self, timeout: float = 15, max_bytes: int = 5 * 1024 * 1024,
+                 allowed_content_types: Iterable[str] = DEFAULT_CONTENT_TYPES,
+                 cache: Optional[HttpCache] = None, pool_size: int = 32,
+                 user_agent: str = DEFAULT_USER_AGENT, max_redirects: int = 5):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.allowed_content_types = tuple(allowed_content_types)
+        self.cache = cache
+        self.user_agent = user_agent
+        self.session = requests.Session()
+        self.session.max_redirects = max_redirects
+        # Keep-alive connections per host, sized to the I/O pool that drives fetches
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "cache_fresh": 0,
+            "cache_revalidated": 0,
+            "cache_misses": 0,
+            "bytes_downloaded": 0,
+            "rejected_too_large": 0,
+            "rejected_content_type": 0,
+            "cache_errors": 0,
+        }
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[name] += amount
+
+    def fetch(self, url: str) -> FetchedPage:
+        """
+        Fetch a text page; raises FetchError (or a subclass) when it is unusable
+        """
+        self._count("requests")
+        cached = self._cache_get(url)
+        headers = {"User-Agent": self.user_agent}
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta["stored_at"] < meta.get("max_age", 0):
+                self._count("cache_fresh")
+                return self._page(url, meta, body, "fresh", 0)
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+        except requests.exceptions.RequestException as e:
+            raise FetchError(str(e)) from e
+
+        with response:
+            if response.status_code == 304 and cached is not None:
+                meta, body = cached
+                meta = dict(meta, **self._freshness(response, meta))
+                self._cache_put(url, meta)
+                self._count("cache_revalidated")
+                return self._page(url, meta, body, "revalidated", 0)
+
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                raise FetchError(str(e)) from e
+
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in self.allowed_content_types:
+                self._count("rejected_content_type")
+                raise UnsupportedContentType(f"Unsupported content type: {content_type}")
+
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                self._count("rejected_too_large")
+                raise ContentTooLarge(f"Page is larger than {self.max_bytes} bytes")
+
+            body = self._read_capped(response)
+            self._count("cache_misses")
+            self._count("bytes_downloaded", len(body))
+
+            meta = {
+                "content_type": content_type or "text/html",
+                "encoding": detect_encoding(body, response.headers.get("Content-Type", "")),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                **self._freshness(response, {}),
+            }
+            if self.cache is not None and self._cacheable(response, meta):
+                self._cache_put(url, meta, body)
+            return self._page(url, meta, body, "miss", len(body))
+
+    def _cache_get(self, url: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(url)
+        except OSError:
+            # The cache is best-effort: e.g. another worker evicted the entry mid-read
+            self._count("cache_errors")
+            return None
+
+    def _cache_put(self, url: str, meta: Dict[str, Any], body: Optional[bytes] = None) -> None:
+        try:
+            self.cache.put(url, meta, body)
+        except OSError:
+            # A full or read-only disk must not fail a page that downloaded fine
+            self._count("cache_errors")
+
+    def _read_capped(self, response: requests.Response) -> bytes:
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(CHUNK_SIZE):
+            received += len(chunk)
+            if received > self.max_bytes:
+                self._count("rejected_too_large")
+                raise ContentTooLarge(f"Page is larger than {self.max_bytes} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _freshness(response: requests.Response, previous: Dict[str, Any]) -> Dict[str, Any]:
+        directives = parse_cache_control(response.headers.get("Cache-Control"))
+        max_age = directives.get("max-age")
+        fresh_for = int(max_age) if max_age and max_age.isdigit() else 0
+        if "no-cache" in directives:
+            fresh_for = 0
+        return {
+            "stored_at": time.time(),
+            "max_age": fresh_for,
+            "etag": response.headers.get("ETag") or previous.get("etag"),
+            "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+        }
+
+    @staticmethod
+    def _cacheable(response: requests.Response, meta: Dict[str, Any]) -> bool:
+        if "no-store" in parse_cache_control(response.headers.get("Cache-Control")):
+            return False
+        return bool(meta["etag"] or meta["last_modified"] or meta["max_age"])
+
+    @staticmethod
+    def _page(url: str, meta: Dict[str, Any], body: bytes, cache_status: str, downloaded: int) -> FetchedPage:
+        try:
+            text = body.decode(meta["encoding"], errors="replace")
+        except LookupError:
+            text = body.decode("utf-8", errors="replace")
+        return FetchedPage(url, text, meta["content_type"], meta["encoding"], cache_status, downloaded)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        self.session.close()
@@ -8,6 +8,11 @@ import json
 from datetime import datetime
 import os
 
+try:
+    from indicator_matcher import IndicatorMatcher
+except ImportError:
+    from api.indicator_matcher import IndicatorMatcher
+
 # Pydantic models
 class TextAnalysisRequest(BaseModel):
     text: str
@@ -39,46 +44,56 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Enhanced fake news indicators
+FAKE_INDICATORS = [
+    "breaking:", "urgent:", "shocking", "unbelievable", "scientists hate this",
+    "doctors don't want you to know", "secret", "conspiracy", "cover-up",
+    "they don't want you to know", "mainstream media won't tell you",
+    "click here", "you won't believe", "this will shock you",
+    "sun will rise from the west", "earth's rotation is reversing",
+    "magnetic field changes", "two weeks of darkness", "first time in history",
+    "scientists confirm impossible", "gravity will reverse", "time will stop",
+    "free iphone", "free phone", "government giving", "all students will receive",
+    "register your name", "claim the offer", "viral message", "whatsapp",
+    "fraudulent websites", "no such scheme exists", "officials have confirmed",
+    "warned the public", "sharing personal details", "digital education initiative",
+    "too good to be true", "limited time offer", "act now", "exclusive offer",
+    "government scheme", "free money", "cash prize", "lottery winner",
+    "congratulations you have won", "claim your prize", "verify your details",
+    "suspicious website", "fake website", "scam alert", "hoax"
+]
+
+REAL_INDICATORS = [
+    "according to", "study shows", "research indicates", "data suggests",
+    "experts say", "published in", "peer-reviewed", "university",
+    "institute", "official statement", "press release"
+]
+
+GOV_SCAM_PATTERNS = [
+    "free iphone", "free phone", "government giving", "all students will receive",
+    "register your name", "viral message", "whatsapp", "fraudulent websites"
+]
+
+# Compiled once per cold start
+INDICATOR_MATCHER = IndicatorMatcher({
+    "fake": FAKE_INDICATORS,
+    "real": REAL_INDICATORS,
+    "gov_scam": GOV_SCAM_PATTERNS,
+})
+
 def analyze_with_patterns(text: str, title: str = None) -> Dict[str, Any]:
     """
     Enhanced pattern-based analysis for deployment
     """
     try:
-        content = (text + " " + (title or "")).lower()
-        
-        # Enhanced fake news indicators
-        fake_indicators = [
-            "breaking:", "urgent:", "shocking", "unbelievable", "scientists hate this",
-            "doctors don't want you to know", "secret", "conspiracy", "cover-up",
-            "they don't want you to know", "mainstream media won't tell you",
-            "click here", "you won't believe", "this will shock you",
-            "sun will rise from the west", "earth's rotation is reversing",
-            "magnetic field changes", "two weeks of darkness", "first time in history",
-            "scientists confirm impossible", "gravity will reverse", "time will stop",
-            "free iphone", "free phone", "government giving", "all students will receive",
-            "register your name", "claim the offer", "viral message", "whatsapp",
-            "fraudulent websites", "no such scheme exists", "officials have confirmed",
-            "warned the public", "sharing personal details", "digital education initiative",
-            "too good to be true", "limited time offer", "act now", "exclusive offer",
-            "government scheme", "free money", "cash prize", "lottery winner",
-            "congratulations you have won", "claim your prize", "verify your details",
-            "suspicious website", "fake website", "scam alert", "hoax"
-        ]
+        hits = INDICATOR_MATCHER.find_all(text, title)
+        counts = INDICATOR_MATCHER.count_by_category(hits)
         
-        real_indicators = [
-            "according to", "study shows", "research indicates", "data suggests",
-            "experts say", "published in", "peer-reviewed", "university",
-            "institute", "official statement", "press release"
-        ]
-        
-        fake_count = sum(1 for indicator in fake_indicators if indicator in content)
-        real_count = sum(1 for indicator in real_indicators if indicator in content)
+        fake_count = counts["fake"]
+        real_count = counts["real"]
+        gov_scam_count = counts["gov_scam"]
         
         # Enhanced confidence calculation
-        gov_scam_patterns = ["free iphone", "free phone", "government giving", "all students will receive", 
-                           "register your name", "viral message", "whatsapp", "fraudulent websites"]
-        gov_scam_count = sum(1 for pattern in gov_scam_patterns if pattern in content)
-        
         if gov_scam_count >= 2:
             verdict = "FAKE"
             confidence = min(0.95, 0.85 + gov_scam_count * 0.05)
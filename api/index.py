@@ -5,6 +5,11 @@ from typing import Dict, Any, List, Optional
 import re
 from datetime import datetime
 
+try:
+    from indicator_matcher import IndicatorMatcher
+except ImportError:
+    from api.indicator_matcher import IndicatorMatcher
+
 # Pydantic models
 class TextAnalysisRequest(BaseModel):
     text: str
@@ -29,25 +34,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+FAKE_INDICATORS = [
+    "breaking:", "urgent:", "shocking", "unbelievable", "free iphone", "free phone",
+    "government giving", "all students will receive", "register your name", "viral message",
+    "whatsapp", "fraudulent websites", "no such scheme exists", "officials confirmed",
+    "conspiracy", "secret", "cover-up", "scientists hate this"
+]
+
+REAL_INDICATORS = [
+    "according to", "study shows", "research indicates", "data suggests",
+    "experts say", "published in", "peer-reviewed", "university", "institute"
+]
+
+# Compiled once per cold start
+INDICATOR_MATCHER = IndicatorMatcher({"fake": FAKE_INDICATORS, "real": REAL_INDICATORS})
+
 def analyze_with_patterns(text: str, title: str = None) -> Dict[str, Any]:
     """Enhanced pattern-based analysis"""
     try:
-        content = (text + " " + (title or "")).lower()
-        
-        fake_indicators = [
-            "breaking:", "urgent:", "shocking", "unbelievable", "free iphone", "free phone",
-            "government giving", "all students will receive", "register your name", "viral message",
-            "whatsapp", "fraudulent websites", "no such scheme exists", "officials confirmed",
-            "conspiracy", "secret", "cover-up", "scientists hate this"
-        ]
-        
-        real_indicators = [
-            "according to", "study shows", "research indicates", "data suggests",
-            "experts say", "published in", "peer-reviewed", "university", "institute"
-        ]
+        counts = INDICATOR_MATCHER.count_by_category(INDICATOR_MATCHER.find_all(text, title))
         
-        fake_count = sum(1 for indicator in fake_indicators if indicator in content)
-        real_count = sum(1 for indicator in real_indicators if indicator in content)
+        fake_count = counts["fake"]
+        real_count = counts["real"]
         
         if fake_count >= 2:
             verdict = "FAKE"
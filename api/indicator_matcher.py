@@ -0,0 +1,147 @@
+"""
+Single-pass multi-pattern matcher for the rule-based fake news indicators.
+
+The indicator lists are compiled once into an Aho-Corasick automaton so that
+every rule is checked in one scan over the text instead of one substring
+search per rule.
+
+api/indicator_matcher.py is a copy kept so the Vercel function in api/ stays
+self-contained; Backened/test_indicator_matcher.py fails when they differ.
+"""
+
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class IndicatorHit(NamedTuple):
+    indicator: str
+    categories: Tuple[str, ...]
+    start: int  # offsets into the original text (or title, see field)
+    end: int
+    field: str = "text"
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class IndicatorMatcher:
+    """
+    Aho-Corasick automaton over lowercase indicator phrases.
+
+    Rules are given as {category: [phrases]}; a phrase may belong to several
+    categories. Matching is case-insensitive and word-boundary aware: a phrase
+    that starts (or ends) with a word character only matches when the
+    neighbouring character in the text is not a word character, so "secret"
+    no longer fires inside "secretary".
+    """
+
+    def __init__(self, rules: Dict[str, Iterable[str]]):
+        categories: Dict[str, List[str]] = {}
+        for category, phrases in rules.items():
+            for phrase in phrases:
+                phrase = phrase.lower()
+                if not phrase:
+                    continue
+                if category not in categories.setdefault(phrase, []):
+                    categories[phrase].append(category)
+
+        self.patterns: List[str] = list(categories)
+        self.categories: List[Tuple[str, ...]] = [tuple(categories[p]) for p in self.patterns]
+        self.rule_categories: Tuple[str, ...] = tuple(rules)
+
+        # Trie: per-state transition dict, failure link and output pattern ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = self._goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = next_state
+                state = next_state
+            self._out[state].append(index)
+
+        # Breadth-first construction of failure links
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state].extend(self._out[self._fail[next_state]])
+
+        self._needs_left_boundary = [_is_word_char(p[0]) for p in self.patterns]
+        self._needs_right_boundary = [_is_word_char(p[-1]) for p in self.patterns]
+
+    def find_all(self, text: str, title: Optional[str] = None) -> List[IndicatorHit]:
+        """
+        Return every indicator occurrence in text, then in title, with its
+        position in the string it was found in (hit.field says which)
+        """
+        hits = self._find(text, "text")
+        if title:
+            hits.extend(self._find(title, "title"))
+        return hits
+
+    def _find(self, text: str, field: str) -> List[IndicatorHit]:
+        content = text.lower()
+        if len(content) == len(text):
+            # Lowercasing never shortens a character, so equal lengths mean equal offsets
+            return [IndicatorHit(self.patterns[index], self.categories[index], start, end, field)
+                    for index, start, end in self._scan(content)]
+        # Some characters lowercase to several (e.g. "İ"): map offsets back to the original
+        origin = [position for position, ch in enumerate(text) for _ in ch.lower()]
+        return [IndicatorHit(self.patterns[index], self.categories[index], origin[start], origin[end - 1] + 1, field)
+                for index, start, end in self._scan(content)]
+
+    def _scan(self, content: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        (pattern index, start, end) of every match in lowercase content
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        patterns = self.patterns
+        length = len(content)
+
+        state = 0
+        for position, ch in enumerate(content):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = position + 1
+            for index in out[state]:
+                start = end - len(patterns[index])
+                if self._needs_left_boundary[index] and start > 0 and _is_word_char(content[start - 1]):
+                    continue
+                if self._needs_right_boundary[index] and end < length and _is_word_char(content[end]):
+                    continue
+                yield index, start, end
+
+    def count_by_category(self, hits: List[IndicatorHit]) -> Dict[str, int]:
+        """
+        Count distinct indicators found per category
+        """
+        seen = set()
+        counts = {category: 0 for category in self.rule_categories}
+        for hit in hits:
+            if hit.indicator in seen:
+                continue
+            seen.add(hit.indicator)
+            for category in hit.categories:
+                counts[category] += 1
+        return counts
@@ -1,46 +1,29 @@
 #!/usr/bin/env python3
 """
-Simple test script to check if the backend is working
+Quick end-to-end check of the backend: a short offline run of the load-test
+harness (Backened/benchmarks/load_test.py) against every analyze endpoint.
+
+    python test_backend.py                                  # in-process server, stub LLM, no network
+    python test_backend.py --target http://localhost:8000   # a server that is already running
+
+Any load_test.py option can be passed through, e.g. --concurrency 16 --requests 1000.
 """
 
-import requests
-import json
-
-def test_backend():
-    """Test if the backend is running and responding"""
-    try:
-        # Test health endpoint
-        print("Testing backend health...")
-        response = requests.get('http://localhost:8000/health', timeout=5)
-        print(f"Health check status: {response.status_code}")
-        print(f"Health check response: {response.json()}")
-        
-        # Test text analysis endpoint
-        print("\nTesting text analysis...")
-        test_data = {
-            "text": "This is a test news article about climate change.",
-            "title": "Test Article"
-        }
-        
-        response = requests.post(
-            'http://localhost:8000/analyze/text',
-            json=test_data,
-            timeout=10
-        )
-        
-        print(f"Analysis status: {response.status_code}")
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Analysis result: {result.get('verdict', 'Unknown')}")
-            print(f"Confidence: {result.get('confidence', 'Unknown')}")
-            print("✅ Backend is working correctly!")
-        else:
-            print(f"❌ Analysis failed: {response.text}")
-            
-    except requests.exceptions.ConnectionError:
-        print("❌ Cannot connect to backend. Make sure it's running on http://localhost:8000")
-    except Exception as e:
-        print(f"❌ Error testing backend: {e}")
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backened", "benchmarks"))
+
+import load_test  # noqa: E402
+
+
+def run_smoke_test(argv=None):
+    """Run a small load test and fail on any error response"""
+    status = load_test.main(["--requests", "40", "--concurrency", "4", "--warmup", "0",
+                             "--output", os.devnull, *(argv or [])])
+    print("✅ Backend is working correctly!" if status == 0 else "❌ Some requests failed (see the table above)")
+    return status
+
 
 if __name__ == "__main__":
-    test_backend()
+    sys.exit(run_smoke_test(sys.argv[1:]))